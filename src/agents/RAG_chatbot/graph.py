@@ -16,6 +16,7 @@ class GraphState(TypedDict):
     """
     input: str #User Question
     generation: str  # LLM generation
+    generation_aborted: bool  # Generation stopped early by the partial grader
     documents: List[str]  
     error: Optional[str]
     output: str  
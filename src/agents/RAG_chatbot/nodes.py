@@ -1,31 +1,20 @@
 from typing import Dict
-from src.services.vector_store import VectorStoreService
-from src.services.graph_store import GraphStoreService
-from langchain_openai import AzureChatOpenAI
-from src.settings import load_config
+from src.services.registry import (get_llm, get_vector_store, get_context_packer, get_config, get_grading_executor, get_metrics)
+from src.services.metrics import instrument_node
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.config import get_stream_writer
 import json
+import logging
+import time
 
-config = load_config()
-vector_store = VectorStoreService({ 
-            **config["pinecone"],
-            **config["openai-embedding"]
-        })
-graph_service = GraphStoreService()
-openai_config = config["openai-llm"]
-llm = AzureChatOpenAI(
-            azure_deployment=openai_config["azure_deployment"],
-            openai_api_version=openai_config["api_version"],
-            azure_endpoint=openai_config["azure_endpoint"],
-            api_key=openai_config["api_key"],
-        )
-
-
+logger = logging.getLogger(__name__)
 
 
 def format_docs(docs):
         return "\n\n".join(doc for doc in docs)
 
+@instrument_node("retrieve")
 def vector_retrieve(state):
     """
     Retrieve documents from vectorstore
@@ -37,15 +26,74 @@ def vector_retrieve(state):
         state (dict): New key added to state, documents, that contains retrieved documents
     """
     input = state["input"]
-    documents = vector_store.retrieve(input, top_k=5)
+    documents = get_vector_store().retrieve(input, top_k=5)
     return {"documents": documents}
 
-def generate(state):
+def discard_answer(reason):
+    """
+    Tell streaming clients that the answer tokens streamed so far will not be used
+
+    Args:
+        reason (str): Why the answer was discarded
+    """
+    try:
+        write = get_stream_writer()
+    except RuntimeError:
+        # Called outside of a graph run, nobody is streaming
+        return
+    write({"event": "rag_answer_discarded", "reason": reason})
+
+def grade_partial_generation(docs_txt, partial_generation, config):
+    """
+    Check whether a partially generated answer is still grounded in the documents
+
+    Args:
+        docs_txt (str): The formatted context documents
+        partial_generation (str): The answer generated so far
+        config (RunnableConfig): Run configuration of the generate node, so the grader call
+            keeps the run's callbacks and tracing when it runs on a pool thread
+
+    Returns:
+        bool: False only if the grader is confident the answer is off-track
+    """
+
+    partial_grader_instructions = """You are a teacher grading a quiz while the student is still writing.
+
+        You will be given FACTS and an INCOMPLETE STUDENT ANSWER.
+
+        Ignore that the answer is unfinished. Only judge whether what has been written so far is grounded in the FACTS and does not contain "hallucinated" information outside the scope of the FACTS."""
+
+    partial_grader_prompt = """FACTS: \n\n {documents} \n\n INCOMPLETE STUDENT ANSWER: {generation}
+
+        Return JSON with single key, binary_score, that is 'yes' or 'no' score to indicate whether the answer so far is grounded in the FACTS."""
+
+    prompt = partial_grader_prompt.format(documents=docs_txt, generation=partial_generation)
+    try:
+        result = get_llm().invoke(
+            [SystemMessage(content=partial_grader_instructions),
+             HumanMessage(content=prompt)],
+            config,
+        )
+    except Exception as e:
+        # Early grading is optional, a failed check must not fail the answer
+        logger.warning(f"Partial grading failed, leaving the answer to the full grader: {e}")
+        return True
+
+    try:
+        return json.loads(result.content)["binary_score"] != "no"
+    except (KeyError, ValueError, json.JSONDecodeError):
+        return True  # Fail-safe, let the full grader decide
+
+@instrument_node("generate")
+def generate(state, config: RunnableConfig):
     """
-    Generate answer using RAG on retrieved documents
+    Generate answer using RAG on retrieved documents, streaming tokens as they arrive.
+    If early grading is enabled, the partial answer is graded in the background and
+    generation stops as soon as it is judged off-track.
 
     Args:
         state (dict): The current graph state
+        config (RunnableConfig): Run configuration, used to propagate streaming callbacks
 
     Returns:
         state (dict): New key added to state, generation, that contains LLM generation
@@ -53,6 +101,7 @@ def generate(state):
     question = state["input"]
     documents = state["documents"]
     loop_step = state.get("loop_step", 0)
+    rag_config = get_config()["rag"]
     
     rag_prompt = """You are an assistant for question-answering tasks. 
 
@@ -70,13 +119,46 @@ def generate(state):
 
     Answer:"""
 
-    docs_txt = format_docs(documents)
+    docs_txt = format_docs(get_context_packer().pack(documents))
     rag_prompt_formatted = rag_prompt.format(context=docs_txt, question=question)
-    generation = llm.invoke([HumanMessage(content=rag_prompt_formatted)])
 
-    return {"generation": generation, "loop_step": loop_step + 1}
+    # Answer tokens are tagged so streaming clients can tell them apart from grader output,
+    # and carry the attempt number so a retried answer can be told apart from the last one
+    answer_llm = get_llm().with_config(tags=["rag_answer"], metadata={"rag_attempt": loop_step + 1})
+    generation = None
+    aborted = False
+    started_at = time.perf_counter()
+    pending_grade = None
+    next_grade_at = rag_config["early_grading_interval"]
+
+    for chunk in answer_llm.stream([HumanMessage(content=rag_prompt_formatted)], config):
+        if generation is None:
+            get_metrics().observe("rag_time_to_first_token_seconds", time.perf_counter() - started_at)
+        generation = chunk if generation is None else generation + chunk
+
+        if not rag_config["early_grading"]:
+            continue
+
+        if pending_grade is not None and pending_grade.done():
+            if not pending_grade.result():
+                aborted = True
+                break
+            pending_grade = None
 
+        if pending_grade is None and len(generation.content) >= next_grade_at:
+            pending_grade = get_grading_executor().submit(grade_partial_generation, docs_txt, generation.content, config)
+            next_grade_at = len(generation.content) + rag_config["early_grading_interval"]
 
+    if pending_grade is not None:
+        pending_grade.cancel()
+
+    if generation is None:
+        generation = AIMessage(content="")
+
+    return {"generation": generation, "loop_step": loop_step + 1, "generation_aborted": aborted}
+
+
+@instrument_node("grade_documents")
 def grade_documents(state):
     """
     Determines whether the retrieved documents are relevant to the question
@@ -104,9 +186,10 @@ def grade_documents(state):
     documents = state.get("documents", [])
 
     filtered_documents = []
-    for doc in documents:
+    # Merge overlapping chunks and drop near-duplicates before paying to grade them
+    for doc in get_context_packer().pack(documents):
         prompt = doc_grader_prompt.format(document=doc, question=input)
-        result = llm.invoke(
+        result = get_llm().invoke(
             [SystemMessage(content=doc_grader_instructions),
              HumanMessage(content=prompt)]
         )
@@ -129,6 +212,7 @@ def grade_documents(state):
     }
 
     
+@instrument_node("determine_output")
 def determine_output(state):
     """
     Determines the final output of the agent.
@@ -176,6 +260,7 @@ def decide_to_generate(state):
         return "generate"
     
 
+@instrument_node("grade_generation")
 def grade_generation_v_documents_and_question(state):
     """
     
@@ -186,6 +271,14 @@ def grade_generation_v_documents_and_question(state):
     generation = state["generation"]
     max_retries = state.get("max_retries", 3)
 
+    #Generation was stopped early by the partial grader, so skip straight to the retry decision
+    if state.get("generation_aborted"):
+        discard_answer("off_track")
+        if state["loop_step"] <= max_retries:
+            return "not supported"
+        else:
+            return "max retries"
+
     #hasulination check propmts
     hallucination_grader_instructions = """
 
@@ -242,9 +335,9 @@ def grade_generation_v_documents_and_question(state):
 
 
     #execute hallucination check
-    hallucination_grader_prompt_formatted = hallucination_grader_prompt.format( documents=format_docs(documents), generation=generation.content)
+    hallucination_grader_prompt_formatted = hallucination_grader_prompt.format( documents=format_docs(get_context_packer().pack(documents)), generation=generation.content)
 
-    result = llm.invoke([SystemMessage(content=hallucination_grader_instructions)] + [HumanMessage(content=hallucination_grader_prompt_formatted)])
+    result = get_llm().invoke([SystemMessage(content=hallucination_grader_instructions)] + [HumanMessage(content=hallucination_grader_prompt_formatted)])
 
     grade = json.loads(result.content)["binary_score"]
     
@@ -254,7 +347,7 @@ def grade_generation_v_documents_and_question(state):
         answer_grader_prompt_formatted = answer_grader_prompt.format(
             question=question, generation=generation.content
         )
-        result = llm.invoke(
+        result = get_llm().invoke(
             [SystemMessage(content=answer_grader_instructions)]
             + [HumanMessage(content=answer_grader_prompt_formatted)]
         )
@@ -265,13 +358,17 @@ def grade_generation_v_documents_and_question(state):
             return "useful"
         elif state["loop_step"] <= max_retries:
             #No hallucination, but question not answered, so retry
+            discard_answer("not_useful")
             return "not useful"
         else:
             #No hallucination, but question not answered, and max retries reached, so return max retries
+            discard_answer("max_retries")
             return "max retries"
     elif state["loop_step"] <= max_retries:
         #Hallucination detected, so retry
+        discard_answer("not_supported")
         return "not supported"
     else:
         #Hallucination detected, and max retries reached, so return max retries
+        discard_answer("max_retries")
         return "max retries"
\ No newline at end of file
@@ -1,63 +1,55 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, HTTPException
+from fastapi.responses import PlainTextResponse
 from langgraph_sdk import get_client
-import time
-import threading
 import logging
-from src.services.sharepoint import SharePointService
-from src.services.vector_store import VectorStoreService
-from src.services.graph_store import GraphStoreService
-from src.services.file_tracker import FileTracker
-from src.settings import load_config
+from src.services import registry
+from src.services.ingest_trigger import IngestTrigger
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def monitor_sharepoint():
-
-    config = load_config()
-    tracker = FileTracker()
-    sharepoint = SharePointService({**config["sharepoint"], **config["azure_doc_intel"]})
-    vector_store = VectorStoreService({ **config["pinecone"], **config["openai-embedding"]})
-    graph_store = GraphStoreService()
-    logger.info("Starting SharePoint monitor...")
-    while True:
-        try:
-            logger.info("Checking SharePoint for new documents...")
-            all_files = sharepoint.get_all_files()
-            new_files = tracker.get_new_files(all_files)
-            
-            if new_files:
-                logger.info(f"Found {len(new_files)} new documents to process")
-                docs = sharepoint.download_and_extract_text(new_files)
-                vector_store.upsert_documents(docs)
-                # Process and store documents in graph store 
-                for file_id, details in docs.items():
-                    result = graph_store.process_and_store_document(
-                        text=details["text"],
-                        )
-                    logger.info(f"Processed {details['name']} into graph with {result['nodes_created']} nodes and {result['relationships_created']} relationships")
-                tracker.mark_files_processed(set(docs.keys()))
-                logger.info("Processing complete for new documents")
-            else:
-                logger.info("No new documents found")
-
-        except Exception as e:
-            logger.error(f"Error during SharePoint monitoring cycle: {e}")
-            
-        # Check for new files every 5 minutes
-        time.sleep(300)    
-       
-
-monitor_thread = threading.Thread(target=monitor_sharepoint, daemon=True)
-monitor_thread.start()
+# SharePoint ingestion runs in separate worker processes, see src/worker.py
 
 #langgraph_client = get_client()
 
-# Initialize FastAPI app
-app = FastAPI()
-
-
-
-    
-
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Optionally build the shared clients up front instead of on the first chat turn
+    if registry.get_config()["services"]["warm_up"]:
+        registry.warm_up(["llm", "vector_store", "context_packer"])
+    yield
 
+# Initialize FastAPI app
+app = FastAPI(lifespan=lifespan)
+
+@app.get("/metrics")
+def metrics():
+    return PlainTextResponse(registry.get_metrics().render(), media_type="text/plain; version=0.0.4")
+
+@app.post("/ingest/trigger", status_code=202)
+async def trigger_ingest(request: Request, validationtoken: str = None):
+    """
+    Wake the ingestion workers. Accepts SharePoint webhook notifications and manual kicks.
+    """
+    # SharePoint validates a new webhook subscription by expecting its token echoed back
+    if validationtoken is not None:
+        return PlainTextResponse(validationtoken, status_code=200)
+
+    client_state = registry.get_config()["ingest"]["trigger_client_state"]
+    if client_state:
+        notifications = []
+        if await request.body():
+            try:
+                payload = await request.json()
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Body is not valid JSON")
+            notifications = payload.get("value", []) if isinstance(payload, dict) else None
+            if not isinstance(notifications, list) or not all(isinstance(n, dict) for n in notifications):
+                raise HTTPException(status_code=400, detail="Expected a SharePoint webhook notification")
+        states = {n.get("clientState") for n in notifications} or {request.headers.get("X-Client-State")}
+        if states != {client_state}:
+            raise HTTPException(status_code=403, detail="Invalid client state")
+
+    IngestTrigger().fire()
+    return {"status": "triggered"}
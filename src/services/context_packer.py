@@ -0,0 +1,148 @@
+from typing import Dict, List, Set
+import logging
+import re
+import zlib
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken ships with langchain-openai, but fall back gracefully
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio used when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+
+class ContextPacker:
+    """Packs retrieved chunks into a compact, token-budgeted prompt context."""
+
+    def __init__(self, config: Dict):
+        """
+        Initialize the ContextPacker.
+
+        Args:
+            config: Dictionary with token_budget, chunk_overlap and optional
+                dedup_threshold, shingle_size, min_overlap and encoding keys
+        """
+        self.token_budget = int(config.get("token_budget", 3000))
+        self.chunk_overlap = int(config.get("chunk_overlap", 0))
+        self.dedup_threshold = float(config.get("dedup_threshold", 0.8))
+        self.shingle_size = int(config.get("shingle_size", 5))
+        self.min_overlap = int(config.get("min_overlap", 20))
+
+        self.encoding = None
+        if tiktoken is not None:
+            try:
+                self.encoding = tiktoken.get_encoding(config.get("encoding", "cl100k_base"))
+            except Exception as e:
+                logger.warning(f"Falling back to approximate token counts: {e}")
+
+    def _encode(self, text: str) -> List[int]:
+        # Documents may contain text like <|endoftext|>, which is content here, not a control token
+        return self.encoding.encode(text, disallowed_special=())
+
+    def count_tokens(self, text: str) -> int:
+        if self.encoding is not None:
+            return len(self._encode(text))
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        if self.encoding is not None:
+            return self.encoding.decode(self._encode(text)[:max_tokens])
+        return text[:max_tokens * CHARS_PER_TOKEN]
+
+    def _shingles(self, text: str) -> Set[int]:
+        """Return the set of hashed word shingles for a chunk."""
+        words = re.findall(r"\w+", text.lower())
+        if len(words) <= self.shingle_size:
+            return {zlib.crc32(" ".join(words).encode())}
+        return {
+            zlib.crc32(" ".join(words[i:i + self.shingle_size]).encode())
+            for i in range(len(words) - self.shingle_size + 1)
+        }
+
+    def _overlap(self, left: str, right: str) -> int:
+        """
+        Return the length of the longest suffix of left that is a prefix of right,
+        bounded by the splitter's chunk overlap, or 0 if there is none.
+        """
+        if self.chunk_overlap < self.min_overlap:
+            return 0
+        tail = left[-self.chunk_overlap:]
+        seed = right[:self.min_overlap]
+        if len(seed) < self.min_overlap:
+            return 0
+
+        idx = tail.find(seed)
+        while idx != -1:
+            if right.startswith(tail[idx:]):
+                return len(tail) - idx
+            idx = tail.find(seed, idx + 1)
+        return 0
+
+    def deduplicate(self, documents: List[str]) -> List[str]:
+        """Drop chunks that are near-duplicates of a higher ranked chunk."""
+        kept, kept_shingles = [], []
+        for doc in documents:
+            shingles = self._shingles(doc)
+            is_duplicate = False
+            for other in kept_shingles:
+                union = len(shingles | other)
+                if union and len(shingles & other) / union >= self.dedup_threshold:
+                    is_duplicate = True
+                    break
+            if not is_duplicate:
+                kept.append(doc)
+                kept_shingles.append(shingles)
+        return kept
+
+    def merge_overlapping(self, documents: List[str]) -> List[str]:
+        """
+        Merge chunks that were split from the same text with overlap, so the shared
+        region is sent once. The merged chunk keeps the better rank of the two.
+        """
+        docs = list(documents)
+        merged = True
+        while merged:
+            merged = False
+            for i in range(len(docs)):
+                for j in range(len(docs)):
+                    if i == j:
+                        continue
+                    k = self._overlap(docs[i], docs[j])
+                    if k:
+                        combined = docs[i] + docs[j][k:]
+                        docs[min(i, j)] = combined
+                        del docs[max(i, j)]
+                        merged = True
+                        break
+                if merged:
+                    break
+        return docs
+
+    def pack(self, documents: List[str]) -> List[str]:
+        """
+        De-duplicate, merge and fit the documents to the token budget,
+        preserving retrieval order.
+
+        Args:
+            documents: Retrieved chunks, best match first
+
+        Returns:
+            List of packed chunks
+        """
+        docs = self.merge_overlapping(self.deduplicate([doc for doc in documents if doc]))
+
+        packed = []
+        remaining = self.token_budget
+        for doc in docs:
+            tokens = self.count_tokens(doc)
+            if tokens <= remaining:
+                packed.append(doc)
+                remaining -= tokens
+            else:
+                if remaining > 0:
+                    packed.append(self._truncate(doc, remaining))
+                break
+        return packed
@@ -0,0 +1,69 @@
+from typing import BinaryIO, Callable, Dict, Optional
+import xml.etree.ElementTree as ET
+import zipfile
+
+# Text extractors that run locally, keyed by lowercase file extension. Formats without
+# an entry here (scanned PDFs, legacy .doc) go through Azure Document Intelligence.
+Extractor = Callable[[BinaryIO], str]
+_extractors: Dict[str, Extractor] = {}
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MARKUP_COMPATIBILITY_NAMESPACE = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+
+
+def register_extractor(extension: str, extractor: Extractor):
+    """Register a local extractor for a file extension such as ".md"."""
+    _extractors[extension.lower()] = extractor
+
+
+def get_extractor(extension: str) -> Optional[Extractor]:
+    return _extractors.get(extension.lower())
+
+
+def extract_plain_text(stream: BinaryIO) -> str:
+    data = stream.read()
+    if data.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return data.decode("utf-16")
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        # Legacy Windows encoded text files
+        return data.decode("cp1252", errors="replace")
+
+
+def extract_docx(stream: BinaryIO) -> str:
+    """Extract paragraph text, including table cells, from a Word .docx file."""
+    with zipfile.ZipFile(stream) as archive:
+        root = ET.fromstring(archive.read("word/document.xml"))
+
+    # Text boxes are stored twice, as DrawingML and as a legacy VML fallback
+    fallback = {
+        paragraph
+        for node in root.iter(f"{MARKUP_COMPATIBILITY_NAMESPACE}Fallback")
+        for paragraph in node.iter(f"{WORD_NAMESPACE}p")
+    }
+    return "\n".join(
+        _paragraph_text(paragraph)
+        for paragraph in root.iter(f"{WORD_NAMESPACE}p")
+        if paragraph not in fallback
+    )
+
+
+def _paragraph_text(paragraph: ET.Element) -> str:
+    """Text of a paragraph, leaving out paragraphs nested in it (e.g. in a text box)."""
+    parts = []
+    for node in paragraph:
+        if node.tag == f"{WORD_NAMESPACE}p":
+            continue
+        if node.tag == f"{WORD_NAMESPACE}t":
+            parts.append(node.text or "")
+        elif node.tag == f"{WORD_NAMESPACE}tab":
+            parts.append("\t")
+        elif node.tag in (f"{WORD_NAMESPACE}br", f"{WORD_NAMESPACE}cr"):
+            parts.append("\n")
+        else:
+            parts.append(_paragraph_text(node))
+    return "".join(parts)
+
+register_extractor(".txt", extract_plain_text)
+register_extractor(".docx", extract_docx)
@@ -1,16 +1,133 @@
 import json
+import logging
 import os
-from typing import Set, Dict
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Set, Dict, Optional
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 class FileTracker:
     def __init__(self, tracking_file: str = "data/processed_files.json"):
         self.tracking_file = tracking_file
+        self.lock_file = f"{tracking_file}.lock"
+        self.lease_dir = os.path.join(os.path.dirname(tracking_file) or ".", "leases")
         if not os.path.exists("data"):
             os.makedirs("data")
+        os.makedirs(self.lease_dir, exist_ok=True)
         if not os.path.exists(self.tracking_file):
             with open(self.tracking_file, "w") as f:
                 json.dump({"processed_files": []}, f)
+
+    def _try_create(self, path: str, owner: str, ttl: float) -> bool:
+        """Atomically create a lock file, returning False if it already exists"""
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w") as f:
+            json.dump({"owner": owner, "expires": time.time() + ttl}, f)
+        return True
+
+    def _read_lock(self, path: str) -> Optional[Dict]:
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            # Missing, or being written right now by its owner
+            return None
+
+    def _remove_if(self, path: str, should_remove: Callable[[Dict], bool]) -> bool:
+        """
+        Delete a lock file only if its contents pass should_remove. The file is renamed out
+        of place first, so no other worker can replace it between the check and the delete,
+        and is put back if the check fails.
+        """
+        claimed_path = f"{path}.{uuid.uuid4().hex}.claimed"
+        try:
+            os.rename(path, claimed_path)
+        except FileNotFoundError:
+            return False
+        lock = self._read_lock(claimed_path)
+        if lock is not None and should_remove(lock):
+            os.remove(claimed_path)
+            return True
+        try:
+            # Link rather than rename, so a lock created meanwhile is never overwritten
+            os.link(claimed_path, path)
+        except FileExistsError:
+            pass
+        os.remove(claimed_path)
+        return False
+
+    def _break_if_expired(self, path: str):
+        """Remove a lock file whose holder has outlived its TTL, e.g. a crashed worker"""
+        lock = self._read_lock(path)
+        if lock is None or lock.get("expires", 0) >= time.time():
+            return
+        # Another worker may have broken it and taken a fresh lock since we read it
+        self._remove_if(path, lambda current: current == lock and current.get("expires", 0) < time.time())
+
+    def _lease_path(self, file_id: str) -> str:
+        return os.path.join(self.lease_dir, f"{file_id}.lease")
+
+    def acquire_lease(self, file_id: str, owner: str, ttl: float) -> bool:
+        """Claim a file for processing. Returns False if another worker holds a live lease"""
+        path = self._lease_path(file_id)
+        if self._try_create(path, owner, ttl):
+            return True
+        self._break_if_expired(path)
+        return self._try_create(path, owner, ttl)
+
+    def renew_lease(self, file_id: str, owner: str, ttl: float) -> bool:
+        """Push back the expiry of a lease. Returns False if the lease is no longer held by owner"""
+        path = self._lease_path(file_id)
+        lock = self._read_lock(path)
+        if lock is None or lock.get("owner") != owner:
+            return False
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"owner": owner, "expires": time.time() + ttl}, f)
+        os.replace(tmp_path, path)
+        return True
+
+    def release_lease(self, file_id: str, owner: str):
+        """Give up a lease, unless it has since been taken over by another worker"""
+        self._remove_if(self._lease_path(file_id), lambda current: current.get("owner") == owner)
+
+    @contextmanager
+    def hold_lease(self, file_id: str, owner: str, ttl: float):
+        """Keep renewing a lease from a background thread while the block runs"""
+        stop = threading.Event()
+
+        def heartbeat():
+            while not stop.wait(ttl / 3):
+                if not self.renew_lease(file_id, owner, ttl):
+                    logger.warning(f"Lost lease on {file_id} to another worker")
+                    return
+
+        thread = threading.Thread(target=heartbeat, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    @contextmanager
+    def _locked(self, timeout: float = 30):
+        """Serialize read-modify-write cycles on the tracking file across processes"""
+        owner = f"{os.getpid()}-{uuid.uuid4().hex}"
+        while not self._try_create(self.lock_file, owner, timeout):
+            self._break_if_expired(self.lock_file)
+            time.sleep(0.05)
+        try:
+            yield
+        finally:
+            self._remove_if(self.lock_file, lambda current: current.get("owner") == owner)
     
     def load_processed_files(self) -> Set[str]:
         with open(self.tracking_file, "r") as f:
@@ -18,8 +135,11 @@ class FileTracker:
         return set(data.get("processed_files", []))
     
     def save_processed_files(self, file_ids: Set[str]):
-        with open(self.tracking_file, "w") as f:
+        # Write to a temp file and swap it in so readers never see a partial file
+        tmp_file = f"{self.tracking_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w") as f:
             json.dump({"processed_files": list(file_ids)}, f)
+        os.replace(tmp_file, self.tracking_file)
     
     def get_new_files(self, current_files: Dict[str, str]) -> Dict[str, str]:
         """Return only files that haven't been processed before"""
@@ -29,6 +149,7 @@ class FileTracker:
                 if file_id not in processed}
     
     def mark_files_processed(self, file_ids: Set[str]):
-        processed = self.load_processed_files()
-        processed.update(file_ids)
-        self.save_processed_files(processed)
\ No newline at end of file
+        with self._locked():
+            processed = self.load_processed_files()
+            processed.update(file_ids)
+            self.save_processed_files(processed)
\ No newline at end of file
@@ -5,15 +5,18 @@ from langchain.schema import Document
 from langchain_neo4j import Neo4jGraph
 from langchain_experimental.graph_transformers import LLMGraphTransformer
 from langchain_openai import AzureOpenAIEmbeddings
-from langchain_openai import AzureChatOpenAI
 from langchain_core.documents import Document
-from src.settings import load_config
+from src.services.registry import get_config, get_llm, get_metrics, get_vector_store
+import hashlib
 import json
 from langchain_community.graphs.graph_document import GraphDocument
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# How chunk embeddings are kept on Neo4j Document nodes
+EMBEDDING_STORAGE_MODES = ("float64", "float32", "none")
+
 class GraphStoreService:
     """Service for processing text documents into knowledge graphs stored in Neo4j."""
 
@@ -25,7 +28,7 @@ class GraphStoreService:
             config_path: Optional path to the configuration file
         """
         try:
-            config = load_config()
+            config = get_config()
             
             neo4j_config = config["neo4j"]
             self.neo4j_graph = Neo4jGraph(
@@ -34,13 +37,7 @@ class GraphStoreService:
                 password=neo4j_config["password"]
             )
 
-            openai_config = config["openai-llm"]
-            self.llm = AzureChatOpenAI(
-                azure_deployment=openai_config["azure_deployment"],
-                openai_api_version=openai_config["api_version"],
-                azure_endpoint=openai_config["azure_endpoint"],
-                api_key=openai_config["api_key"]
-            )
+            self.llm = get_llm()
             
             self.graph_transformer = LLMGraphTransformer(llm=self.llm)
 
@@ -50,7 +47,13 @@ class GraphStoreService:
                 chunk_overlap=embedding_config["chunk_overlap"],
             )
             
-            self.embedding_dimension = embedding_config.get("dimension")
+            # Embeddings stored in Neo4j may be truncated below the model dimension, which suits
+            # models trained to support shortened vectors such as text-embedding-3
+            self.embedding_dimension = neo4j_config.get("embedding_dimension") or embedding_config.get("dimension")
+            self.embedding_storage = neo4j_config.get("embedding_storage", "float64")
+            self.index_quantization = neo4j_config.get("index_quantization", False)
+            if self.embedding_storage not in EMBEDDING_STORAGE_MODES:
+                raise ValueError(f"Unknown embedding storage '{self.embedding_storage}', expected one of {EMBEDDING_STORAGE_MODES}")
             self.embeddings = AzureOpenAIEmbeddings(
                 azure_deployment=embedding_config["deployment"],
                 openai_api_version=embedding_config["api_version"],
@@ -77,7 +80,19 @@ class GraphStoreService:
             List of Document objects
         """
         chunks = self.text_splitter.split_text(text)
-        return [Document(page_content=chunk) for chunk in chunks]
+        return [Document(page_content=chunk, metadata={"id": self._chunk_id(chunk)}) for chunk in chunks]
+
+    @staticmethod
+    def _chunk_id(chunk: str) -> str:
+        """
+        Id of the Document node for a chunk. Pinecone holds the same chunk text, so matches
+        from the primary vector store can be resolved to graph nodes without a Neo4j index.
+        """
+        return hashlib.md5(chunk.encode("utf-8")).hexdigest()
+
+    def _compact_embedding(self, embedding: List[float]) -> List[float]:
+        """Truncate an embedding to the dimension stored in Neo4j"""
+        return embedding[:self.embedding_dimension] if self.embedding_dimension else embedding
 
     def process_and_store_document(self, text: str) -> Dict:
         """
@@ -94,26 +109,47 @@ class GraphStoreService:
             document_chunks = self._create_document_chunks(text)
             
             graph_documents = []
+            embedding_rows = []
             batch_size = 5 
             for i in range(0, len(document_chunks), batch_size):
                 batch = document_chunks[i:i+batch_size]
                 
-                chunk_texts = [chunk.page_content for chunk in batch]
-                chunk_embeddings = self.embeddings.embed_documents(chunk_texts)
-                
-                graph_batch = self.graph_transformer.convert_to_graph_documents(batch)
-                
-                for doc, embedding in zip(graph_batch, chunk_embeddings):
-                    doc.source.metadata["embedding"] = embedding
+                with get_metrics().time_dependency("azure_openai", "graph_transform"):
+                    graph_batch = self.graph_transformer.convert_to_graph_documents(batch)
+
+                if self.embedding_storage != "none":
+                    chunk_texts = [chunk.page_content for chunk in batch]
+                    with get_metrics().time_dependency("azure_openai", "embed"):
+                        chunk_embeddings = self.embeddings.embed_documents(chunk_texts)
+
+                    for doc, embedding in zip(graph_batch, chunk_embeddings):
+                        embedding = self._compact_embedding(embedding)
+                        if self.embedding_storage == "float64":
+                            doc.source.metadata["embedding"] = embedding
+                        else:
+                            embedding_rows.append({"id": doc.source.metadata["id"], "embedding": embedding})
 
                 graph_documents.extend(graph_batch)
                 
             
-            self.neo4j_graph.add_graph_documents(
-                graph_documents,
-                include_source=True,
-                baseEntityLabel=True  # This ensures the source document is linked
-            )
+            with get_metrics().time_dependency("neo4j", "add_graph_documents"):
+                self.neo4j_graph.add_graph_documents(
+                    graph_documents,
+                    include_source=True,
+                    baseEntityLabel=True  # This ensures the source document is linked
+                )
+
+            if embedding_rows:
+                # Stored as a float32 vector property, half the size of a list of floats
+                with get_metrics().time_dependency("neo4j", "set_embeddings"):
+                    self.neo4j_graph.query(
+                        """
+                        UNWIND $rows AS row
+                        MATCH (d:Document {id: row.id})
+                        CALL db.create.setNodeVectorProperty(d, 'embedding', row.embedding)
+                        """,
+                        params={"rows": embedding_rows}
+                    )
         
             result = {
                 "nodes_created": sum(len(doc.nodes) for doc in graph_documents),
@@ -130,22 +166,29 @@ class GraphStoreService:
 
     def create_indices(self):
         """
-        Create a vector index in Neo4j for the embeddings if it doesn't exist.
+        Create a vector index in Neo4j for the embeddings if it doesn't exist, sized to the
+        stored embedding dimension. No index is needed when embeddings are not stored.
         """
-        index_query = """
+        if self.embedding_storage == "none":
+            return
+
+        # Index quantization needs Neo4j 5.23 or later
+        quantization = ",\n            `vector.quantization.enabled`: true" if self.index_quantization else ""
+        index_query = f"""
         CREATE VECTOR INDEX `document_embeddings` IF NOT EXISTS
         FOR (n:Document)
         ON n.embedding
-        OPTIONS {indexConfig: {
+        OPTIONS {{indexConfig: {{
             `vector.dimensions`: $dimension,
-            `vector.similarity_function`: 'cosine'
-        }}
+            `vector.similarity_function`: 'cosine'{quantization}
+        }}}}
         """
         try:
-            self.neo4j_graph.query(
-                index_query,
-                params={"dimension": self.embedding_dimension}
-            )
+            with get_metrics().time_dependency("neo4j", "create_index"):
+                self.neo4j_graph.query(
+                    index_query,
+                    params={"dimension": self.embedding_dimension}
+                )
         except Exception as e:
             logger.error(f"Error creating vector index: {str(e)}")
             raise
@@ -164,28 +207,39 @@ class GraphStoreService:
             List of dictionaries containing relevant entities, their relationships, and connected nodes
         """
        
-        #Embed the question
-        question_embedding = self.embeddings.embed_query(question)
-        
-        #Query the vector index for similar chunks
-        vector_query = """
-        CALL db.index.vector.queryNodes(
-            'document_embeddings', 
-            $top_k, 
-            $question_embedding
-        ) YIELD node, score
-        WHERE score >= $score_threshold
-        RETURN node, score
-        ORDER BY score DESC
-        """
-        vector_results = self.neo4j_graph.query(
-            vector_query,
-            params={
-                "top_k": top_k,
-                "question_embedding": question_embedding,
-                "score_threshold": score_threshold
-            }
-        )
+        if self.embedding_storage == "none":
+            #Find similar chunks in the primary vector store and resolve them to graph nodes.
+            #Pinecone returns raw cosine (-1 to 1), rescale it to the (1 + cos) / 2 that Neo4j reports
+            vector_results = [
+                {"node": {"id": self._chunk_id(text)}, "score": (1 + score) / 2}
+                for text, score in get_vector_store().retrieve_with_scores(question, top_k=top_k)
+                if (1 + score) / 2 >= score_threshold
+            ]
+        else:
+            #Embed the question
+            with get_metrics().time_dependency("azure_openai", "embed"):
+                question_embedding = self._compact_embedding(self.embeddings.embed_query(question))
+            
+            #Query the vector index for similar chunks
+            vector_query = """
+            CALL db.index.vector.queryNodes(
+                'document_embeddings', 
+                $top_k, 
+                $question_embedding
+            ) YIELD node, score
+            WHERE score >= $score_threshold
+            RETURN node, score
+            ORDER BY score DESC
+            """
+            with get_metrics().time_dependency("neo4j", "vector_query"):
+                vector_results = self.neo4j_graph.query(
+                    vector_query,
+                    params={
+                        "top_k": top_k,
+                        "question_embedding": question_embedding,
+                        "score_threshold": score_threshold
+                    }
+                )
     
         if not vector_results:
             logger.info(f"No semantically similar chunks found for question: {question}")
@@ -214,10 +268,11 @@ class GraphStoreService:
                     related_node_labels: labels(related_node)
                 }) as entity_relationships
             """
-            entities = self.neo4j_graph.query(
-                entity_query,
-                params={"chunk_id": chunk_node["id"]}
-            )
+            with get_metrics().time_dependency("neo4j", "entity_query"):
+                entities = self.neo4j_graph.query(
+                    entity_query,
+                    params={"chunk_id": chunk_node["id"]}
+                )
             results.append(entities)
    
         formatted_output = [] 
@@ -0,0 +1,67 @@
+import os
+import time
+import uuid
+from typing import Dict, Optional
+
+
+class IngestTrigger:
+    """File-based signal that wakes ingestion workers, which may run in other processes."""
+
+    def __init__(self, trigger_file: str = "data/ingest.trigger", check_interval: float = 1.0):
+        self.trigger_file = trigger_file
+        self.check_interval = check_interval
+        os.makedirs(os.path.dirname(trigger_file) or ".", exist_ok=True)
+        self._seen = self._stamp()
+
+    def _stamp(self) -> Optional[str]:
+        try:
+            with open(self.trigger_file, "r") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def fire(self):
+        """Ask every worker to run an ingestion cycle now"""
+        tmp_file = f"{self.trigger_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w") as f:
+            f.write(f"{time.time_ns()}-{uuid.uuid4().hex}")
+        os.replace(tmp_file, self.trigger_file)
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Sleep until the trigger fires or the timeout elapses.
+
+        Returns:
+            True if woken by a trigger, False on timeout
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            stamp = self._stamp()
+            if stamp != self._seen:
+                self._seen = stamp
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.check_interval, remaining))
+
+
+class AdaptivePollInterval:
+    """Poll interval that backs off while the library is idle and resets after changes."""
+
+    def __init__(self, config: Dict):
+        self.min_seconds = float(config["poll_min_seconds"])
+        self.max_seconds = float(config["poll_max_seconds"])
+        self.backoff_factor = float(config["poll_backoff_factor"])
+        self.current = self.min_seconds
+
+    def record(self, changed: bool) -> float:
+        """Record the outcome of a cycle and return how long to wait before the next one"""
+        if changed:
+            self.current = self.min_seconds
+        else:
+            self.current = min(self.current * self.backoff_factor, self.max_seconds)
+        return self.current
+
+    def reset(self):
+        self.current = self.min_seconds
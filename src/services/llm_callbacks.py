@@ -0,0 +1,41 @@
+from typing import Any, Dict
+from uuid import UUID
+import time
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from src.services.registry import get_metrics
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """Records latency, failures and token usage of every Azure OpenAI chat call."""
+
+    def __init__(self):
+        self._started: Dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages, *, run_id: UUID, **kwargs: Any):
+        if get_metrics().enabled:
+            self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any):
+        start = self._started.pop(run_id, None)
+        if start is None:
+            return
+        metrics = get_metrics()
+        metrics.observe("dependency_duration_seconds", time.perf_counter() - start, service="azure_openai", operation="chat")
+
+        usage = (response.llm_output or {}).get("token_usage")
+        if not usage:
+            # Streamed responses carry usage on the message instead
+            for generations in response.generations:
+                for generation in generations:
+                    message = getattr(generation, "message", None)
+                    usage = getattr(message, "usage_metadata", None) or usage
+        metrics.record_token_usage(usage)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        start = self._started.pop(run_id, None)
+        if start is None:
+            return
+        metrics = get_metrics()
+        metrics.observe("dependency_duration_seconds", time.perf_counter() - start, service="azure_openai", operation="chat")
+        metrics.inc("dependency_errors_total", service="azure_openai", operation="chat")
@@ -0,0 +1,159 @@
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import anyio
+import httpx
+from langchain_core.tools import BaseTool, StructuredTool
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from src.services.registry import get_metrics
+from src.services.tool_cache import ToolResultCache
+
+logger = logging.getLogger(__name__)
+
+# Transport failures that mean the session is gone and a reconnect is worth trying
+CONNECTION_ERRORS = (
+    ConnectionError,
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    httpx.TransportError,
+)
+
+
+class MCPSessionPool:
+    """Long-lived, reconnecting MCP session with cached tool schemas, shared by all graph instances."""
+
+    def __init__(self, config: Dict):
+        """
+        Initialize the MCPSessionPool. No connection is opened until tools are first requested.
+
+        Args:
+            config: Dictionary with the MCP servers, in MultiServerMCPClient format, and
+                the result cache settings
+        """
+        self.servers = config["servers"]
+        self.cache = ToolResultCache(config.get("cache", {}))
+        self.connect_timeout = config.get("connect_timeout", 30)
+        self._tools: Dict[str, BaseTool] = {}
+        self._wrapped_tools: List[BaseTool] = []
+        self._task: Optional[asyncio.Task] = None
+        self._closed: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Bumped on every connect, so callers can tell whether their session was already replaced
+        self._generation = 0
+
+    async def _run_session(self, ready: asyncio.Future, closed: asyncio.Event):
+        # The client is entered and exited in this one task, as its task groups require
+        try:
+            async with MultiServerMCPClient(self.servers) as client:
+                self._tools = {tool.name: tool for tool in client.get_tools()}
+                ready.set_result(None)
+                await closed.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning(f"MCP session closed unexpectedly: {e}")
+
+    def _is_connected(self) -> bool:
+        return (
+            self._task is not None
+            and not self._task.done()
+            and self._loop is asyncio.get_running_loop()
+        )
+
+    async def _connect(self):
+        loop = asyncio.get_running_loop()
+        # Unpublish the old session first, so concurrent callers wait for the new one
+        previous, self._task = self._task, None
+        if previous is not None and self._loop is loop:
+            self._closed.set()
+            await asyncio.gather(previous, return_exceptions=True)
+
+        self._loop = loop
+        closed = asyncio.Event()
+        ready = loop.create_future()
+        with get_metrics().time_dependency("mcp", "connect"):
+            task = asyncio.create_task(self._run_session(ready, closed))
+            await asyncio.wait_for(ready, timeout=self.connect_timeout)
+        # Only publish the session once its tools have been listed
+        self._task, self._closed = task, closed
+        self._generation += 1
+        logger.info(f"Connected to MCP servers with {len(self._tools)} tools")
+
+    async def ensure_connected(self):
+        if self._is_connected():
+            return
+        if self._lock is None or self._loop is not asyncio.get_running_loop():
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._is_connected():
+                await self._connect()
+
+    async def reconnect(self, generation: Optional[int] = None):
+        """
+        Replace the session. When generation is given, only reconnect if that session is still
+        the current one, so callers that failed on the same broken session reconnect once.
+        """
+        if self._lock is None or self._loop is not asyncio.get_running_loop():
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if generation is not None and generation != self._generation and self._is_connected():
+                return
+            await self._connect()
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """
+        Call a tool on the shared session, reconnecting once if the connection was lost.
+        Results of allowlisted read-only tools are served from the cache while fresh.
+        """
+        cacheable = self.cache.is_cacheable(name)
+        if cacheable:
+            hit, result = self.cache.get(name, arguments)
+            if hit:
+                return result
+
+        await self.ensure_connected()
+        generation = self._generation
+        try:
+            with get_metrics().time_dependency("mcp", name):
+                result = await self._tools[name].ainvoke(arguments)
+        except CONNECTION_ERRORS as e:
+            logger.warning(f"MCP connection lost while calling {name}, reconnecting: {e}")
+            await self.reconnect(generation)
+            with get_metrics().time_dependency("mcp", name):
+                result = await self._tools[name].ainvoke(arguments)
+
+        if cacheable:
+            self.cache.set(name, arguments, result)
+        return result
+
+    def _wrap(self, tool: BaseTool) -> BaseTool:
+        name = tool.name
+
+        async def call(**kwargs):
+            return await self.call_tool(name, kwargs)
+
+        return StructuredTool(
+            name=name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            coroutine=call,
+        )
+
+    async def get_tools(self) -> List[BaseTool]:
+        """
+        Return tools bound to the shared session. Schemas are listed once per connection and
+        the returned tools keep working across reconnects.
+        """
+        await self.ensure_connected()
+        if {tool.name for tool in self._wrapped_tools} != set(self._tools):
+            self._wrapped_tools = [self._wrap(tool) for tool in self._tools.values()]
+        return self._wrapped_tools
+
+    async def close(self):
+        if self._task is not None and self._loop is asyncio.get_running_loop():
+            self._closed.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
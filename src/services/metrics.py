@@ -0,0 +1,167 @@
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional, Tuple
+import bisect
+import functools
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+HELP = {
+    "rag_node_duration_seconds": "Time spent in each LangGraph node.",
+    "rag_time_to_first_token_seconds": "Time from the start of generate to the first answer token.",
+    "dependency_duration_seconds": "Latency of outbound calls to external services.",
+    "dependency_errors_total": "Failed outbound calls to external services.",
+    "llm_tokens_total": "Tokens used by LLM calls.",
+    "cache_requests_total": "Cache lookups by result.",
+    "cache_entries": "Entries currently held in a cache.",
+    "ingest_queue_depth": "Documents waiting to be ingested by this worker.",
+    "ingest_documents_total": "Documents ingested by result.",
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class MetricsService:
+    """In-process Prometheus-style counters, gauges and histograms with optional trace spans."""
+
+    def __init__(self, config: Dict):
+        """
+        Initialize the MetricsService.
+
+        Args:
+            config: Dictionary with enabled and tracing flags
+        """
+        self.enabled = bool(config.get("enabled", False))
+        self.buckets = tuple(config.get("buckets", DEFAULT_BUCKETS))
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, list]] = {}
+
+        self.tracer = None
+        if self.enabled and config.get("tracing", False):
+            try:
+                from opentelemetry import trace
+                self.tracer = trace.get_tracer("sharepoint-rag-chatbot")
+            except ImportError:
+                logger.warning("Tracing requested but opentelemetry is not installed")
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                # Bucket counts followed by sum and count
+                series[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            entry = series[key]
+            entry[bisect.bisect_left(self.buckets, value)] += 1
+            entry[-2] += value
+            entry[-1] += 1
+
+    @contextmanager
+    def _timer(self, name: str, span_name: str, error_counter: Optional[str], labels: Dict):
+        span = self.tracer.start_as_current_span(span_name, attributes=labels) if self.tracer else nullcontext()
+        start = time.perf_counter()
+        with span:
+            try:
+                yield
+            except Exception:
+                if error_counter:
+                    self.inc(error_counter, **labels)
+                raise
+            finally:
+                self.observe(name, time.perf_counter() - start, **labels)
+
+    def time_node(self, node: str):
+        """Context manager timing a LangGraph node"""
+        if not self.enabled:
+            return nullcontext()
+        return self._timer("rag_node_duration_seconds", f"node.{node}", None, {"node": node})
+
+    def time_dependency(self, service: str, operation: str):
+        """Context manager timing an outbound call and counting its failures"""
+        if not self.enabled:
+            return nullcontext()
+        return self._timer(
+            "dependency_duration_seconds", f"{service}.{operation}", "dependency_errors_total",
+            {"service": service, "operation": operation},
+        )
+
+    def record_token_usage(self, usage: Optional[Dict], model: str = "chat"):
+        """Count tokens from an OpenAI style token_usage or LangChain usage_metadata dict"""
+        if not self.enabled or not usage:
+            return
+        prompt = usage.get("prompt_tokens", usage.get("input_tokens", 0))
+        completion = usage.get("completion_tokens", usage.get("output_tokens", 0))
+        self.inc("llm_tokens_total", prompt, model=model, type="prompt")
+        self.inc("llm_tokens_total", completion, model=model, type="completion")
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for kind, store in (("counter", self._counters), ("gauge", self._gauges)):
+                for name, series in sorted(store.items()):
+                    if name in HELP:
+                        lines.append(f"# HELP {name} {HELP[name]}")
+                    lines.append(f"# TYPE {name} {kind}")
+                    for labels, value in series.items():
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+            for name, series in sorted(self._histograms.items()):
+                if name in HELP:
+                    lines.append(f"# HELP {name} {HELP[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, entry in series.items():
+                    cumulative = 0
+                    for bound, count in zip(self.buckets + (float("inf"),), entry):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f"{name}_bucket{_format_labels(labels, ('le', le))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {entry[-2]}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {entry[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+def instrument_node(node: str):
+    """Decorator timing a LangGraph node or routing function, keeping its signature intact."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            from src.services.registry import get_metrics
+            with get_metrics().time_node(node):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,166 @@
+from typing import Any, Callable, Dict, Iterable, Optional
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Process-wide services, built on first use and shared by the graphs and the SharePoint monitor
+_lock = threading.RLock()
+_factories: Dict[str, Callable[[], Any]] = {}
+_instances: Dict[str, Any] = {}
+
+
+def register(name: str, factory: Callable[[], Any]):
+    """Register (or replace) the factory used to build a service."""
+    with _lock:
+        _factories[name] = factory
+        _instances.pop(name, None)
+
+
+def override(name: str, instance: Any):
+    """Use an already built instance for a service, e.g. a fake in tests or benchmarks."""
+    with _lock:
+        _instances[name] = instance
+
+
+def reset(name: Optional[str] = None):
+    """Forget built instances so they are recreated on next use."""
+    with _lock:
+        if name is None:
+            _instances.clear()
+        else:
+            _instances.pop(name, None)
+
+
+def get(name: str) -> Any:
+    """Return the shared instance of a service, building it on first use."""
+    instance = _instances.get(name)
+    if instance is not None:
+        return instance
+
+    with _lock:
+        if name not in _instances:
+            if name not in _factories:
+                raise KeyError(f"No service registered under '{name}'")
+            logger.info(f"Initializing shared service '{name}'")
+            _instances[name] = _factories[name]()
+        return _instances[name]
+
+
+def warm_up(names: Optional[Iterable[str]] = None):
+    """
+    Eagerly build services so the first request does not pay their startup cost.
+
+    Args:
+        names: Services to build, defaults to every registered service
+    """
+    for name in list(names if names is not None else _factories):
+        get(name)
+
+
+def _build_config():
+    from src.settings import load_config
+    return load_config()
+
+
+def _build_metrics():
+    from src.services.metrics import MetricsService
+    return MetricsService(get_config()["metrics"])
+
+
+def _build_llm():
+    from langchain_openai import AzureChatOpenAI
+    from src.services.llm_callbacks import LLMMetricsCallback
+    openai_config = get_config()["openai-llm"]
+    return AzureChatOpenAI(
+        azure_deployment=openai_config["azure_deployment"],
+        openai_api_version=openai_config["api_version"],
+        azure_endpoint=openai_config["azure_endpoint"],
+        api_key=openai_config["api_key"],
+        # Streamed answers only report token usage when it is requested explicitly
+        stream_usage=True,
+        callbacks=[LLMMetricsCallback()],
+    )
+
+
+def _build_vector_store():
+    from src.services.vector_store import VectorStoreService
+    config = get_config()
+    return VectorStoreService({**config["pinecone"], **config["openai-embedding"]})
+
+
+def _build_graph_store():
+    from src.services.graph_store import GraphStoreService
+    return GraphStoreService()
+
+
+def _build_sharepoint():
+    from src.services.sharepoint import SharePointService
+    config = get_config()
+    return SharePointService({**config["sharepoint"], **config["azure_doc_intel"]})
+
+
+def _build_context_packer():
+    from src.services.context_packer import ContextPacker
+    config = get_config()
+    return ContextPacker({
+        **config["rag"],
+        "chunk_overlap": config["openai-embedding"]["chunk_overlap"],
+    })
+
+
+def _build_mcp_pool():
+    from src.services.mcp_pool import MCPSessionPool
+    return MCPSessionPool(get_config()["mcp"])
+
+
+def _build_grading_executor():
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=get_config()["rag"]["early_grading_workers"])
+
+
+register("config", _build_config)
+register("metrics", _build_metrics)
+register("llm", _build_llm)
+register("vector_store", _build_vector_store)
+register("graph_store", _build_graph_store)
+register("sharepoint", _build_sharepoint)
+register("context_packer", _build_context_packer)
+register("grading_executor", _build_grading_executor)
+register("mcp_pool", _build_mcp_pool)
+
+
+def get_config() -> Dict[str, Any]:
+    return get("config")
+
+
+def get_metrics():
+    return get("metrics")
+
+
+def get_llm():
+    return get("llm")
+
+
+def get_vector_store():
+    return get("vector_store")
+
+
+def get_graph_store():
+    return get("graph_store")
+
+
+def get_sharepoint():
+    return get("sharepoint")
+
+
+def get_context_packer():
+    return get("context_packer")
+
+
+def get_grading_executor():
+    return get("grading_executor")
+
+
+def get_mcp_pool():
+    return get("mcp_pool")
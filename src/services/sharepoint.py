@@ -2,12 +2,20 @@ from office365.sharepoint.client_context import ClientContext
 from office365.runtime.auth.authentication_context import AuthenticationContext
 from azure.ai.formrecognizer import DocumentAnalysisClient
 from azure.core.credentials import AzureKeyCredential
-from typing import List, Dict
+from typing import List, Dict, Optional
+from src.services.registry import get_metrics
+from src.services.extractors import get_extractor
+import logging
 import hashlib
+import fnmatch
 import tempfile
 import json
 import os
-import io
+
+logger = logging.getLogger(__name__)
+
+class FileTooLargeError(Exception):
+    """Raised when a download grows past the configured per-file size cap."""
 
 class SharePointService:
     def __init__(self, config: dict):
@@ -20,17 +28,20 @@ class SharePointService:
         
     def connect(self):
         auth_ctx = AuthenticationContext(self.config["url"])
-        auth_ctx.acquire_token_for_user(
-            self.config["username"],
-            self.config["password"]
-        )
+        with get_metrics().time_dependency("sharepoint", "authenticate"):
+            auth_ctx.acquire_token_for_user(
+                self.config["username"],
+                self.config["password"]
+            )
         return ClientContext(self.config["url"], auth_ctx)
     
     def get_all_files(self) -> Dict[str, dict]:
         """Return dict of {file_id: file_details} for text documents only"""
         ctx = self.connect()
+        metrics = get_metrics()
         lib = ctx.web.lists.get_by_title(self.config["library_name"])
-        items = lib.items.get().execute_query()
+        with metrics.time_dependency("sharepoint", "list_items"):
+            items = lib.items.get().execute_query()
         
         allowed_extensions = {".txt", ".doc", ".docx", ".pdf"}
         files = {}
@@ -38,7 +49,8 @@ class SharePointService:
         for item in items:
             file = item.file
             ctx.load(file)
-            ctx.execute_query()
+            with metrics.time_dependency("sharepoint", "load_file"):
+                ctx.execute_query()
             
             file_name = file.properties["Name"]
             _, ext = os.path.splitext(file_name.lower())
@@ -51,34 +63,91 @@ class SharePointService:
                 files[file_id] = {
                     "name": file_name,
                     "server_path": file.properties["ServerRelativeUrl"],
+                    "size": int(file.properties.get("Length") or 0),
                 }
         
         return files
     
-    def download_and_extract_text(self, file_details: Dict[str, dict]) -> List[Dict]:
+    def extract_text(self, file_name: str, file_stream) -> str:
         """
-        Download documents from SharePoint in memory, process them using Azure Document Intelligence.
+        Extract text locally when a registered extractor supports the format, otherwise
+        with Azure Document Intelligence.
         """
-        ctx = self.connect()
+        _, ext = os.path.splitext(file_name.lower())
+        extractor = get_extractor(ext)
+        if extractor is not None:
+            try:
+                return extractor(file_stream)
+            except Exception as e:
+                logger.warning(f"Local extraction failed for {file_name}, using Document Intelligence: {e}")
+                file_stream.seek(0)
+
+        with get_metrics().time_dependency("document_intelligence", "analyze"):
+            poller = self.document_analysis_client.begin_analyze_document("prebuilt-layout", file_stream)
+            result = poller.result()
+        return result.content
+
+    def skip_reason(self, file_name: str, size: int) -> Optional[str]:
+        """Return why a file should not be ingested, or None if it should"""
+        for pattern in self.config.get("skip_patterns", []):
+            if fnmatch.fnmatch(file_name.lower(), pattern.lower()):
+                return f"matches skip pattern '{pattern}'"
+        max_bytes = self.config.get("max_file_bytes")
+        if max_bytes and size > max_bytes:
+            return f"size {size} bytes exceeds limit of {max_bytes} bytes"
+        return None
+
+    def download_and_extract_text(self, file_details: Dict[str, dict], ctx: Optional[ClientContext] = None) -> List[Dict]:
+        """
+        Stream documents from SharePoint into spooled temp files and extract their text, locally
+        for text-native formats and with Azure Document Intelligence for the rest. Files are kept
+        in memory only below the spool threshold, so peak memory does not grow with file size.
+        Files rejected by the skip rules or size cap are left out of the result.
+
+        Args:
+            file_details: Files to download, as returned by get_all_files
+            ctx: Context from connect() to reuse across calls, a new one is created if omitted
+        """
+        ctx = ctx or self.connect()
+        metrics = get_metrics()
         results = {}
 
         for file_id, details in file_details.items():
             file = ctx.web.get_file_by_server_relative_url(details["server_path"])
             ctx.load(file)
-            ctx.execute_query()
+            with metrics.time_dependency("sharepoint", "load_file"):
+                ctx.execute_query()
 
-            #Download file content to memory
-            file_stream = io.BytesIO()
-            file.download(file_stream).execute_query()
-            file_stream.seek(0)
+            size = int(file.properties.get("Length") or details.get("size") or 0)
+            reason = self.skip_reason(details["name"], size)
+            if reason:
+                logger.info(f"Skipping {details['name']}: {reason}")
+                continue
 
-            #Process with Azure Document Intelligence
-            poller = self.document_analysis_client.begin_analyze_document("prebuilt-layout", file_stream)
-            result = poller.result()
+            max_bytes = self.config.get("max_file_bytes")
+
+            def check_size(downloaded: int):
+                # Guard against files that grow past the cap after their size was reported
+                if max_bytes and downloaded > max_bytes:
+                    raise FileTooLargeError(f"{details['name']} exceeds limit of {max_bytes} bytes")
+
+            with tempfile.SpooledTemporaryFile(max_size=self.config.get("spool_threshold_bytes", 8 * 1024 * 1024)) as file_stream:
+                try:
+                    with metrics.time_dependency("sharepoint", "download"):
+                        file.download_session(
+                            file_stream,
+                            chunk_downloaded=check_size,
+                            chunk_size=self.config.get("download_chunk_bytes", 1024 * 1024),
+                        ).execute_query()
+                except FileTooLargeError as e:
+                    logger.info(f"Skipping {e}")
+                    continue
+                file_stream.seek(0)
 
-            enriched_details = details.copy()
-            enriched_details["text"] = result.content
-            results[file_id] = enriched_details
+                enriched_details = details.copy()
+                enriched_details["size"] = size
+                enriched_details["text"] = self.extract_text(details["name"], file_stream)
+                results[file_id] = enriched_details
 
         return results
 
@@ -0,0 +1,70 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+import json
+import threading
+import time
+from src.services.registry import get_metrics
+
+
+class ToolResultCache:
+    """Size-bounded TTL cache for results of idempotent tool calls."""
+
+    def __init__(self, config: Dict, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the ToolResultCache.
+
+        Args:
+            config: Dictionary with ttls, mapping each cacheable tool name to its TTL in
+                seconds, and max_entries
+            clock: Time source, replaceable in tests
+        """
+        self.ttls: Dict[str, float] = dict(config.get("ttls", {}))
+        self.max_entries = int(config.get("max_entries", 256))
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def is_cacheable(self, tool: str) -> bool:
+        return self.ttls.get(tool, 0) > 0
+
+    @staticmethod
+    def _key(tool: str, arguments: Dict[str, Any]) -> Tuple[str, str]:
+        # Key order and whitespace must not matter, so serialize canonically
+        return tool, json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
+
+    def get(self, tool: str, arguments: Dict[str, Any]) -> Tuple[bool, Any]:
+        """
+        Look up a cached result.
+
+        Returns:
+            Tuple of (hit, result)
+        """
+        key = self._key(tool, arguments)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                result = "miss"
+            elif entry[0] <= self.clock():
+                del self._entries[key]
+                result = "expired"
+            else:
+                self._entries.move_to_end(key)
+                result = "hit"
+        get_metrics().inc("cache_requests_total", cache="mcp_tools", tool=tool, result=result)
+        return (True, entry[1]) if result == "hit" else (False, None)
+
+    def set(self, tool: str, arguments: Dict[str, Any], value: Any):
+        if not self.is_cacheable(tool):
+            return
+        key = self._key(tool, arguments)
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttls[tool], value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            size = len(self._entries)
+        get_metrics().set_gauge("cache_entries", size, cache="mcp_tools")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
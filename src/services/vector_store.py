@@ -1,10 +1,12 @@
 from pinecone import ServerlessSpec, Pinecone
 from langchain_openai import AzureOpenAIEmbeddings
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from src.services.registry import get_metrics
 
 class VectorStoreService:
     def __init__(self, config: Dict[str, str]):
+        self.config = config
         self.pinecone = Pinecone(api_key=config["pinecone_api_key"])
         self.index_name = config["index_name"]
         self.embeddings = AzureOpenAIEmbeddings(
@@ -23,7 +25,8 @@ class VectorStoreService:
 
     def initialize_index(self):
         # First check if index exists
-        index_names = [index["name"] for index in self.pinecone.list_indexes()]
+        with get_metrics().time_dependency("pinecone", "list_indexes"):
+            index_names = [index["name"] for index in self.pinecone.list_indexes()]
         if self.index_name not in index_names:
             # Create index if it doesn't exist
             self.pinecone.create_index(
@@ -44,17 +47,25 @@ class VectorStoreService:
         for file_id, details in docs.items():
             chunks = self.text_splitter.split_text(details["text"])
             for j, chunk in enumerate(chunks):
-                embedding = self.embeddings.embed_query(chunk)
+                with get_metrics().time_dependency("azure_openai", "embed"):
+                    embedding = self.embeddings.embed_query(chunk)
                 vector_id = f'{details["name"]}_chunk_{j}'
                 vectors.append((vector_id, embedding, {"text": chunk}))
         
-        self.index.upsert(vectors=vectors)
+        with get_metrics().time_dependency("pinecone", "upsert"):
+            self.index.upsert(vectors=vectors)
 
     def retrieve(self, query: str, top_k: int = 3) -> List[str]:
-        query_embedding = self.embeddings.embed_query(query)
-        results = self.index.query(
-            vector=query_embedding,
-            top_k=top_k,
-            include_metadata=True
-        )
-        return [match.metadata["text"] for match in results.matches]
\ No newline at end of file
+        return [text for text, _ in self.retrieve_with_scores(query, top_k)]
+
+    def retrieve_with_scores(self, query: str, top_k: int = 3) -> List[Tuple[str, float]]:
+        metrics = get_metrics()
+        with metrics.time_dependency("azure_openai", "embed"):
+            query_embedding = self.embeddings.embed_query(query)
+        with metrics.time_dependency("pinecone", "query"):
+            results = self.index.query(
+                vector=query_embedding,
+                top_k=top_k,
+                include_metadata=True
+            )
+        return [(match.metadata["text"], match.score) for match in results.matches]
\ No newline at end of file
@@ -2,6 +2,14 @@ import os
 from dotenv import load_dotenv
 from typing import Dict, Any
 
+def _parse_ttls(value: str) -> Dict[str, float]:
+    """Parse "tool_a:60,tool_b:30" into {"tool_a": 60.0, "tool_b": 30.0}"""
+    ttls = {}
+    for item in filter(None, (part.strip() for part in (value or "").split(","))):
+        name, _, ttl = item.partition(":")
+        ttls[name.strip()] = float(ttl or 60)
+    return ttls
+
 def load_config() -> Dict[str, Any]:
     load_dotenv()
     return {
@@ -10,6 +18,10 @@ def load_config() -> Dict[str, Any]:
             "username": os.getenv("SHAREPOINT_USERNAME"),
             "password": os.getenv("SHAREPOINT_PASSWORD"),
             "library_name": os.getenv("SHAREPOINT_LIBRARY_NAME"),
+            "max_file_bytes": int(float(os.getenv("SHAREPOINT_MAX_FILE_MB", "200")) * 1024 * 1024),
+            "spool_threshold_bytes": int(float(os.getenv("SHAREPOINT_SPOOL_THRESHOLD_MB", "8")) * 1024 * 1024),
+            "download_chunk_bytes": int(float(os.getenv("SHAREPOINT_DOWNLOAD_CHUNK_MB", "1")) * 1024 * 1024),
+            "skip_patterns": [p.strip() for p in os.getenv("SHAREPOINT_SKIP_PATTERNS", "").split(",") if p.strip()],
         },
         "azure_doc_intel": {
             "key": os.getenv("AZURE_DOCUMENT_INTEL_KEY"),
@@ -24,7 +36,10 @@ def load_config() -> Dict[str, Any]:
         "neo4j": {
             "uri": os.getenv("NEO4J_URI"),
             "user": os.getenv("NEO4J_USER"),
-            "password": os.getenv("NEO4J_PASSWORD")
+            "password": os.getenv("NEO4J_PASSWORD"),
+            "embedding_storage": os.getenv("NEO4J_EMBEDDING_STORAGE", "float64"),
+            "embedding_dimension": int(os.getenv("NEO4J_EMBEDDING_DIMENSION") or 0) or None,
+            "index_quantization": os.getenv("NEO4J_VECTOR_INDEX_QUANTIZATION", "false").lower() == "true",
         },
         "openai-embedding": {
             "azure_endpoint": os.getenv("EMBEDDING_MODEL_ENDPOINT"),
@@ -40,5 +55,41 @@ def load_config() -> Dict[str, Any]:
             "azure_deployment": os.getenv("LLM_DEPLOYMENT_NAME"),
             "api_key": os.getenv("LLM_API_KEY"),
             "azure_endpoint": os.getenv("LLM_API_ENDPOINT"),
+        },
+        "rag": {
+            "token_budget": int(os.getenv("RAG_CONTEXT_TOKEN_BUDGET", "3000")),
+            "dedup_threshold": float(os.getenv("RAG_CONTEXT_DEDUP_THRESHOLD", "0.8")),
+            "shingle_size": int(os.getenv("RAG_CONTEXT_SHINGLE_SIZE", "5")),
+            "early_grading": os.getenv("RAG_EARLY_GRADING", "false").lower() == "true",
+            "early_grading_interval": int(os.getenv("RAG_EARLY_GRADING_INTERVAL", "400")),
+            "early_grading_workers": int(os.getenv("RAG_EARLY_GRADING_WORKERS", "4")),
+        },
+        "ingest": {
+            "workers": int(os.getenv("INGEST_WORKERS", "1")),
+            "poll_min_seconds": int(os.getenv("INGEST_POLL_MIN_SECONDS", "30")),
+            "poll_max_seconds": int(os.getenv("INGEST_POLL_MAX_SECONDS", "900")),
+            "poll_backoff_factor": float(os.getenv("INGEST_POLL_BACKOFF_FACTOR", "2")),
+            "lease_seconds": int(os.getenv("INGEST_LEASE_SECONDS", "1800")),
+            "trigger_client_state": os.getenv("INGEST_TRIGGER_CLIENT_STATE"),
+        },
+        "mcp": {
+            "servers": {
+                "Tools": {
+                    "url": os.getenv("MCP_SERVER_URL", "http://localhost:8000/sse"),
+                    "transport": "sse",
+                },
+            },
+            "connect_timeout": int(os.getenv("MCP_CONNECT_TIMEOUT", "30")),
+            "cache": {
+                "ttls": _parse_ttls(os.getenv("MCP_TOOL_CACHE_TTLS")),
+                "max_entries": int(os.getenv("MCP_TOOL_CACHE_SIZE", "256")),
+            },
+        },
+        "metrics": {
+            "enabled": os.getenv("METRICS_ENABLED", "false").lower() == "true",
+            "tracing": os.getenv("METRICS_TRACING", "false").lower() == "true",
+        },
+        "services": {
+            "warm_up": os.getenv("SERVICES_WARM_UP", "false").lower() == "true",
         }
     }
\ No newline at end of file
@@ -0,0 +1,156 @@
+import argparse
+import http.server
+import logging
+import multiprocessing
+import os
+import random
+import socket
+import threading
+from typing import Dict, Optional
+from src.services.file_tracker import FileTracker
+from src.services.ingest_trigger import IngestTrigger, AdaptivePollInterval
+from src.services import registry
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def ingest_file(file_id: str, details: dict, sharepoint, vector_store, graph_store, sharepoint_ctx=None) -> Optional[Dict]:
+    """
+    Download, extract and store a single SharePoint document in the vector and graph stores.
+    Pass the SharePoint context of the current cycle to avoid signing in again for every file.
+
+    Returns:
+        Dictionary with statistics from the graph store, or None if the file was skipped
+    """
+    docs = sharepoint.download_and_extract_text({file_id: details}, sharepoint_ctx)
+    if file_id not in docs:
+        # Rejected by the size cap or skip rules
+        return None
+    vector_store.upsert_documents(docs)
+    result = graph_store.process_and_store_document(
+        text=docs[file_id]["text"],
+        )
+    logger.info(f"Processed {details['name']} into graph with {result['nodes_created']} nodes and {result['relationships_created']} relationships")
+    return result
+
+def process_new_files(new_files: Dict[str, dict], worker_name: str, tracker: FileTracker,
+                      sharepoint, vector_store, graph_store, lease_seconds: float):
+    """
+    Ingest every new file this worker can lease, skipping files held by other workers.
+    """
+    # Visit files in a different order on every worker to keep lease contention low
+    file_ids = list(new_files)
+    random.shuffle(file_ids)
+    metrics = registry.get_metrics()
+    # Sign in to SharePoint once per cycle rather than once per file
+    sharepoint_ctx = sharepoint.connect()
+    for remaining, file_id in enumerate(file_ids):
+        metrics.set_gauge("ingest_queue_depth", len(file_ids) - remaining)
+        if not tracker.acquire_lease(file_id, worker_name, lease_seconds):
+            metrics.inc("ingest_documents_total", result="leased_elsewhere")
+            continue
+        try:
+            # Another worker may have finished it between listing and leasing
+            if file_id in tracker.load_processed_files():
+                continue
+            # Keep the lease alive for documents that take longer than lease_seconds
+            with tracker.hold_lease(file_id, worker_name, lease_seconds):
+                result = ingest_file(file_id, new_files[file_id], sharepoint, vector_store, graph_store, sharepoint_ctx)
+            # Skipped files are marked processed too, so they are not downloaded again
+            tracker.mark_files_processed({file_id})
+            metrics.inc("ingest_documents_total", result="processed" if result is not None else "skipped")
+        except Exception as e:
+            metrics.inc("ingest_documents_total", result="failed")
+            logger.error(f"Error processing {new_files[file_id]['name']}: {e}")
+        finally:
+            tracker.release_lease(file_id, worker_name)
+    metrics.set_gauge("ingest_queue_depth", 0)
+
+def serve_metrics(port: int):
+    """Expose this worker's metrics on http://0.0.0.0:<port>/metrics from a background thread"""
+
+    class MetricsHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.get_metrics().render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+def monitor_sharepoint(worker_name: str = None, metrics_port: int = None):
+
+    config = registry.get_config()["ingest"]
+    if metrics_port:
+        serve_metrics(metrics_port)
+    worker_name = worker_name or f"{socket.gethostname()}-{os.getpid()}"
+    tracker = FileTracker()
+    trigger = IngestTrigger()
+    poll_interval = AdaptivePollInterval(config)
+    sharepoint = registry.get_sharepoint()
+    vector_store = registry.get_vector_store()
+    graph_store = registry.get_graph_store()
+    logger.info(f"Starting SharePoint monitor {worker_name}...")
+    while True:
+        new_files = {}
+        try:
+            logger.info("Checking SharePoint for new documents...")
+            all_files = sharepoint.get_all_files()
+            new_files = tracker.get_new_files(all_files)
+
+            if new_files:
+                logger.info(f"Found {len(new_files)} new documents to process")
+                process_new_files(new_files, worker_name, tracker, sharepoint, vector_store, graph_store, config["lease_seconds"])
+                logger.info("Processing complete for new documents")
+            else:
+                logger.info("No new documents found")
+
+        except Exception as e:
+            logger.error(f"Error during SharePoint monitoring cycle: {e}")
+
+        # Back off while the library is idle, but wake immediately on a webhook or manual trigger
+        interval = poll_interval.record(changed=bool(new_files))
+        if trigger.wait(interval):
+            logger.info("Ingestion triggered")
+            poll_interval.reset()
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest SharePoint documents into the vector and graph stores.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: INGEST_WORKERS)")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Serve /metrics on this port, plus one per extra worker")
+    args = parser.parse_args()
+
+    workers = args.workers or registry.get_config()["ingest"]["workers"]
+    if workers == 1:
+        monitor_sharepoint(metrics_port=args.metrics_port)
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    processes = [
+        ctx.Process(
+            target=monitor_sharepoint,
+            kwargs={"metrics_port": args.metrics_port + i if args.metrics_port else None},
+            name=f"ingest-worker-{i}",
+        )
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+if __name__ == "__main__":
+    main()
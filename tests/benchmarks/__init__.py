@@ -0,0 +1 @@
+"""Offline benchmarks that run against local stand-ins for the external services."""
@@ -0,0 +1,151 @@
+"""
+Load test the RAG_chatbot graph with many concurrent sessions against fake backends.
+
+Usage:
+    python -m tests.benchmarks.chat_load_benchmark --users 50 --questions 500 --llm-latency 0.3
+"""
+import argparse
+import asyncio
+import json
+import math
+import threading
+import time
+from collections import Counter
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from tests.benchmarks.fakes import FakeChatModel, FakeVectorStore
+from tests.benchmarks.ingest_benchmark import bench_config
+
+
+class LLMCallCounter(BaseCallbackHandler):
+    """Counts chat model calls made on behalf of one session."""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        with self._lock:
+            self.calls += 1
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+async def run_session(graph, question: str, max_retries: int) -> dict:
+    counter = LLMCallCounter()
+    start = time.perf_counter()
+    first_token = None
+    final_state = {}
+    error = None
+
+    try:
+        async for mode, chunk in graph.astream(
+            {"input": question, "max_retries": max_retries},
+            config={"callbacks": [counter]},
+            stream_mode=["messages", "values"],
+        ):
+            if mode == "messages":
+                _, metadata = chunk
+                if first_token is None and "rag_answer" in metadata.get("tags", []):
+                    first_token = time.perf_counter() - start
+            else:
+                final_state = chunk
+    except Exception as e:
+        error = type(e).__name__
+
+    return {
+        "latency": time.perf_counter() - start,
+        "ttft": first_token,
+        "llm_calls": counter.calls,
+        "loop_step": final_state.get("loop_step", 0),
+        "error": error,
+    }
+
+
+async def run_load(graph, args) -> list:
+    semaphore = asyncio.Semaphore(args.users)
+
+    async def limited(i: int):
+        async with semaphore:
+            return await run_session(graph, f"Question {i} about the quarterly budget?", args.max_retries)
+
+    return await asyncio.gather(*(limited(i) for i in range(args.questions)))
+
+
+def summarize(results: list, elapsed: float) -> dict:
+    ok = [r for r in results if r["error"] is None]
+    latencies = [r["latency"] for r in ok]
+    ttfts = [r["ttft"] for r in ok if r["ttft"] is not None]
+    calls = [r["llm_calls"] for r in ok]
+    return {
+        "questions": len(results),
+        "errors": dict(Counter(r["error"] for r in results if r["error"] is not None)),
+        "throughput_qps": len(ok) / elapsed if elapsed else 0.0,
+        "latency": {f"p{p}": percentile(latencies, p) for p in (50, 95, 99)},
+        "ttft": {f"p{p}": percentile(ttfts, p) for p in (50, 95, 99)},
+        "llm_calls_per_question": sum(calls) / len(calls) if calls else 0.0,
+        "loop_step": dict(sorted(Counter(r["loop_step"] for r in ok).items())),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent chat load test for RAG_chatbot.")
+    parser.add_argument("--users", type=int, default=50, help="Concurrent sessions")
+    parser.add_argument("--questions", type=int, default=200, help="Total questions to ask")
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="LLM time to first token (s)")
+    parser.add_argument("--token-latency", type=float, default=0.01, help="LLM latency per streamed token (s)")
+    parser.add_argument("--answer-tokens", type=int, default=50)
+    parser.add_argument("--llm-failure-rate", type=float, default=0.0)
+    parser.add_argument("--retrieval-latency", type=float, default=0.05)
+    parser.add_argument("--retrieval-failure-rate", type=float, default=0.0)
+    parser.add_argument("--relevance-rate", type=float, default=0.8, help="Chance a document is graded relevant")
+    parser.add_argument("--grounded-rate", type=float, default=0.9, help="Chance an answer is graded grounded")
+    parser.add_argument("--useful-rate", type=float, default=0.9, help="Chance an answer is graded useful")
+    parser.add_argument("--early-grading", action="store_true", help="Enable early grading of partial answers")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    from src.services import registry
+
+    config = bench_config()
+    config["rag"]["early_grading"] = args.early_grading
+    registry.override("config", config)
+    registry.override("llm", FakeChatModel(
+        latency=args.llm_latency,
+        token_latency=args.token_latency,
+        answer_tokens=args.answer_tokens,
+        failure_rate=args.llm_failure_rate,
+        relevance_rate=args.relevance_rate,
+        grounded_rate=args.grounded_rate,
+        useful_rate=args.useful_rate,
+    ))
+    registry.override("vector_store", FakeVectorStore(args.retrieval_latency, args.retrieval_failure_rate))
+
+    from src.agents.RAG_chatbot.graph import graph
+
+    start = time.perf_counter()
+    results = asyncio.run(run_load(graph, args))
+    summary = summarize(results, time.perf_counter() - start)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print(f"questions: {summary['questions']}  errors: {summary['errors'] or 0}  throughput: {summary['throughput_qps']:.2f} q/s")
+    for name in ("latency", "ttft"):
+        print(f"{name:>8}: " + "  ".join(f"{p}={v:.3f}s" for p, v in summary[name].items()))
+    print(f"llm calls/question: {summary['llm_calls_per_question']:.2f}")
+    print(f"loop_step distribution: {summary['loop_step']}")
+
+
+if __name__ == "__main__":
+    main()
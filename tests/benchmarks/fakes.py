@@ -0,0 +1,286 @@
+import hashlib
+import json
+import math
+import random
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_community.graphs.graph_document import GraphDocument, Node, Relationship
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+WORDS = (
+    "policy report budget contract employee customer project invoice meeting review "
+    "quarter revenue forecast supplier training safety compliance audit schedule release "
+    "manager team office region product service support security incident approval"
+).split()
+
+
+class SyntheticLibrary:
+    """
+    A deterministic SharePoint document library. Content is always plain text; the
+    extension decides whether it is extracted locally or sent to Document Intelligence.
+    """
+
+    def __init__(self, size: int, words_per_doc: int = 1500, seed: int = 0, extension: str = ".txt"):
+        rng = random.Random(seed)
+        self.files = {}
+        for i in range(size):
+            text = " ".join(
+                (rng.choice(WORDS).capitalize() + "." if j % 12 == 11 else rng.choice(WORDS))
+                for j in range(words_per_doc)
+            )
+            server_path = f"/sites/bench/Shared Documents/doc_{i}{extension}"
+            self.files[server_path] = SimpleNamespace(
+                properties={"Name": f"doc_{i}{extension}", "ServerRelativeUrl": server_path, "Length": len(text.encode("utf-8"))},
+                unique_id=f"unique-{seed}-{i}",
+                time_last_modified="2024-01-01T00:00:00Z",
+                content=text.encode("utf-8"),
+            )
+
+
+class _Query:
+    def __init__(self, result=None, action=None):
+        self._result = result
+        self._action = action
+
+    def execute_query(self):
+        if self._action is not None:
+            self._action()
+        return self._result
+
+
+class FakeClientContext:
+    """Stand-in for office365's ClientContext, serving files from a SyntheticLibrary."""
+
+    def __init__(self, library: SyntheticLibrary):
+        self.library = library
+        items = [SimpleNamespace(file=self._file(path)) for path in library.files]
+        list_items = SimpleNamespace(get=lambda: _Query(items))
+        self.web = SimpleNamespace(
+            lists=SimpleNamespace(get_by_title=lambda title: SimpleNamespace(items=list_items)),
+            get_file_by_server_relative_url=self._file,
+        )
+
+    def _file(self, server_path: str):
+        source = self.library.files[server_path]
+        file = SimpleNamespace(**vars(source))
+        file.download_session = lambda stream, chunk_downloaded=None, chunk_size=1024 * 1024: _Query(
+            action=lambda: self._download(source.content, stream, chunk_downloaded, chunk_size)
+        )
+        return file
+
+    @staticmethod
+    def _download(content: bytes, stream, chunk_downloaded, chunk_size: int):
+        for offset in range(0, len(content), chunk_size):
+            stream.write(content[offset:offset + chunk_size])
+            if chunk_downloaded:
+                chunk_downloaded(min(offset + chunk_size, len(content)))
+
+    def load(self, *args):
+        pass
+
+    def execute_query(self):
+        pass
+
+
+class FakeAuthenticationContext:
+    def __init__(self, url: str):
+        self.url = url
+
+    def acquire_token_for_user(self, username: str, password: str):
+        pass
+
+
+class FakeDocumentAnalysisClient:
+    """Stand-in for Azure Document Intelligence with a fixed plus per-page latency."""
+
+    def __init__(self, latency: float = 0.0, page_latency: float = 0.0, chars_per_page: int = 3000, **kwargs):
+        self.latency = latency
+        self.page_latency = page_latency
+        self.chars_per_page = chars_per_page
+
+    def begin_analyze_document(self, model_id: str, document):
+        text = document.read().decode("utf-8")
+        pages = max(1, math.ceil(len(text) / self.chars_per_page))
+        time.sleep(self.latency + pages * self.page_latency)
+        return SimpleNamespace(result=lambda: SimpleNamespace(content=text))
+
+
+class HashEmbeddings:
+    """Deterministic embeddings derived from a hash of the text."""
+
+    def __init__(self, dimension: int, latency: float = 0.0, **kwargs):
+        self.dimension = dimension
+        self.latency = latency
+
+    def _embed(self, text: str) -> List[float]:
+        rng = random.Random(hashlib.sha256(text.encode("utf-8")).digest())
+        vector = [rng.gauss(0, 1) for _ in range(self.dimension)]
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.latency)
+        return self._embed(text)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency)
+        return [self._embed(text) for text in texts]
+
+
+class FakeGraphTransformer:
+    """Stand-in for LLMGraphTransformer that links capitalized words found in each chunk."""
+
+    def __init__(self, llm=None, latency: float = 0.0, **kwargs):
+        self.latency = latency
+
+    def convert_to_graph_documents(self, documents) -> List[GraphDocument]:
+        graph_documents = []
+        for document in documents:
+            time.sleep(self.latency)
+            names = sorted({word.strip(".") for word in document.page_content.split() if word[:1].isupper()})
+            nodes = [Node(id=name, type="Concept") for name in names]
+            relationships = [
+                Relationship(source=a, target=b, type="RELATED_TO")
+                for a, b in zip(nodes, nodes[1:])
+            ]
+            graph_documents.append(GraphDocument(nodes=nodes, relationships=relationships, source=document))
+        return graph_documents
+
+
+class InMemoryPineconeIndex:
+    def __init__(self):
+        self.vectors: Dict[str, tuple] = {}
+
+    def upsert(self, vectors):
+        for vector_id, values, metadata in vectors:
+            self.vectors[vector_id] = (values, metadata)
+
+    def query(self, vector, top_k: int, include_metadata: bool = False, **kwargs):
+        scored = sorted(
+            ((sum(a * b for a, b in zip(vector, values)), vector_id, metadata)
+             for vector_id, (values, metadata) in self.vectors.items()),
+            reverse=True,
+        )[:top_k]
+        matches = [
+            SimpleNamespace(id=vector_id, score=score, metadata=metadata if include_metadata else None)
+            for score, vector_id, metadata in scored
+        ]
+        return SimpleNamespace(matches=matches)
+
+
+class InMemoryPinecone:
+    """Stand-in for the Pinecone client, keeping every index in memory."""
+
+    def __init__(self, api_key: str = None, **kwargs):
+        self.indexes: Dict[str, InMemoryPineconeIndex] = {}
+
+    def list_indexes(self):
+        return [{"name": name} for name in self.indexes]
+
+    def create_index(self, name: str, **kwargs):
+        self.indexes[name] = InMemoryPineconeIndex()
+
+    def Index(self, name: str) -> InMemoryPineconeIndex:
+        return self.indexes.setdefault(name, InMemoryPineconeIndex())
+
+
+class InMemoryNeo4jGraph:
+    """Stand-in for Neo4jGraph that records the stored graph documents."""
+
+    def __init__(self, url: str = None, username: str = None, password: str = None, **kwargs):
+        self.nodes: Dict[str, dict] = {}
+        self.relationships: List[tuple] = []
+        self.documents: List = []
+
+    def query(self, query: str, params: dict = None):
+        return []
+
+    def add_graph_documents(self, graph_documents, include_source: bool = False, baseEntityLabel: bool = False):
+        for graph_document in graph_documents:
+            for node in graph_document.nodes:
+                self.nodes[node.id] = {"type": node.type, **node.properties}
+            for relationship in graph_document.relationships:
+                self.relationships.append((relationship.source.id, relationship.type, relationship.target.id))
+            if include_source:
+                self.documents.append(graph_document.source)
+
+
+class FakeServiceError(Exception):
+    """Raised by the fakes to simulate a failed call to an external service."""
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model stand-in with configurable latency and failure rate. Grader prompts
+    get a JSON binary_score drawn from the configured pass rates, anything else
+    gets a streamed synthetic answer.
+    """
+
+    latency: float = 0.0
+    token_latency: float = 0.0
+    failure_rate: float = 0.0
+    answer_tokens: int = 50
+    relevance_rate: float = 1.0
+    grounded_rate: float = 1.0
+    useful_rate: float = 1.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _call_started(self):
+        time.sleep(self.latency)
+        if random.random() < self.failure_rate:
+            raise FakeServiceError("Simulated LLM failure")
+
+    def _grade(self, prompt: str) -> Optional[str]:
+        if "binary_score" not in prompt:
+            return None
+        if "FACTS" in prompt:
+            rate = self.grounded_rate
+        elif "QUESTION:" in prompt:
+            rate = self.useful_rate
+        else:
+            rate = self.relevance_rate
+        score = "yes" if random.random() < rate else "no"
+        return json.dumps({"binary_score": score, "explanation": "Simulated grade."})
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        self._call_started()
+        content = self._grade(messages[-1].content)
+        if content is None:
+            time.sleep(self.token_latency * self.answer_tokens)
+            content = " ".join(f"token{i}" for i in range(self.answer_tokens))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _stream(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        self._call_started()
+        content = self._grade(messages[-1].content)
+        tokens = [content] if content is not None else [f"token{i} " for i in range(self.answer_tokens)]
+        for token in tokens:
+            time.sleep(self.token_latency)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+
+class FakeVectorStore:
+    """Stand-in for VectorStoreService.retrieve returning synthetic chunks."""
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.library = SyntheticLibrary(20, words_per_doc=150, seed=seed)
+
+    def retrieve(self, query: str, top_k: int = 3) -> List[str]:
+        time.sleep(self.latency)
+        if random.random() < self.failure_rate:
+            raise FakeServiceError("Simulated vector store failure")
+        files = list(self.library.files.values())
+        start = int(hashlib.md5(query.encode("utf-8")).hexdigest(), 16) % len(files)
+        return [files[(start + i) % len(files)].content.decode("utf-8") for i in range(top_k)]
@@ -0,0 +1,166 @@
+"""
+Measure SharePoint ingestion throughput without any external service.
+
+Usage:
+    python -m tests.benchmarks.ingest_benchmark --sizes 10 50 200 --di-latency 0.05
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from unittest.mock import patch
+
+from tests.benchmarks.fakes import (
+    FakeAuthenticationContext,
+    FakeClientContext,
+    FakeDocumentAnalysisClient,
+    FakeGraphTransformer,
+    HashEmbeddings,
+    InMemoryNeo4jGraph,
+    InMemoryPinecone,
+    SyntheticLibrary,
+)
+
+
+def bench_config(chunk_size: int = 1000, chunk_overlap: int = 200, dimension: int = 1536) -> dict:
+    os.environ["EMBEDDING_MODEL_CHUNK_SIZE"] = str(chunk_size)
+    os.environ["EMBEDDING_MODEL_CHUNK_OVERLAP"] = str(chunk_overlap)
+    os.environ["EMBEDDING_MODEL_DIMENSION"] = str(dimension)
+    from src.settings import load_config
+    config = load_config()
+    config["sharepoint"].update(url="https://bench.sharepoint.local/sites/bench", library_name="Documents")
+    return config
+
+
+@contextmanager
+def offline_services(args, library: SyntheticLibrary):
+    """Build the real services with every external client replaced by a local stand-in."""
+    from src.services import registry
+
+    def embeddings(**kwargs):
+        return HashEmbeddings(args.dimension, latency=args.embedding_latency)
+
+    with ExitStack() as stack:
+        for target, replacement in {
+            "src.services.sharepoint.DocumentAnalysisClient":
+                lambda **kwargs: FakeDocumentAnalysisClient(args.di_latency, args.di_page_latency),
+            # The key is unset without credentials, which the real credential rejects
+            "src.services.sharepoint.AzureKeyCredential": lambda key: None,
+            "src.services.sharepoint.AuthenticationContext": FakeAuthenticationContext,
+            "src.services.sharepoint.ClientContext": lambda url, auth_ctx: FakeClientContext(library),
+            "src.services.vector_store.Pinecone": InMemoryPinecone,
+            "src.services.vector_store.AzureOpenAIEmbeddings": embeddings,
+            "src.services.graph_store.Neo4jGraph": InMemoryNeo4jGraph,
+            "src.services.graph_store.AzureOpenAIEmbeddings": embeddings,
+            "src.services.graph_store.LLMGraphTransformer":
+                lambda llm: FakeGraphTransformer(llm, latency=args.graph_latency),
+        }.items():
+            stack.enter_context(patch(target, replacement))
+
+        registry.reset()
+        registry.override("config", bench_config(args.chunk_size, args.chunk_overlap, args.dimension))
+        registry.override("llm", object())
+        try:
+            yield registry.get_sharepoint(), registry.get_vector_store(), registry.get_graph_store()
+        finally:
+            registry.reset()
+
+
+def _timed(stage_times: dict, stage: str, fn):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stage_times[stage] += time.perf_counter() - start
+    return wrapper
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_size(size: int, args) -> dict:
+    """Run one ingestion cycle over a synthetic library of the given size."""
+    from src.services.file_tracker import FileTracker
+    from src.worker import process_new_files
+
+    library = SyntheticLibrary(size, words_per_doc=args.words, seed=args.seed, extension=args.extension)
+    stage_times = defaultdict(float)
+
+    with tempfile.TemporaryDirectory() as tmp_dir, offline_services(args, library) as (sharepoint, vector_store, graph_store):
+        tracker = FileTracker(os.path.join(tmp_dir, "processed_files.json"))
+
+        sharepoint.get_all_files = _timed(stage_times, "list", sharepoint.get_all_files)
+        sharepoint.download_and_extract_text = _timed(stage_times, "extract", sharepoint.download_and_extract_text)
+        vector_store.upsert_documents = _timed(stage_times, "vector_store", vector_store.upsert_documents)
+        graph_store.process_and_store_document = _timed(stage_times, "graph_store", graph_store.process_and_store_document)
+
+        start = time.perf_counter()
+        new_files = tracker.get_new_files(sharepoint.get_all_files())
+        process_new_files(new_files, "bench", tracker, sharepoint, vector_store, graph_store, lease_seconds=3600)
+        elapsed = time.perf_counter() - start
+
+        processed = len(tracker.load_processed_files())
+        chunks = len(vector_store.index.vectors)
+
+    return {
+        "documents": size,
+        "processed": processed,
+        "chunks": chunks,
+        "seconds": elapsed,
+        "documents_per_sec": processed / elapsed if elapsed else 0.0,
+        "chunks_per_sec": chunks / elapsed if elapsed else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        "stage_seconds": dict(stage_times),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline SharePoint ingestion benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200], help="Library sizes to benchmark")
+    parser.add_argument("--words", type=int, default=1500, help="Words per synthetic document")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--extension", default=".pdf", choices=[".pdf", ".txt"],
+                        help="File type of the library: .pdf goes through Document Intelligence, .txt is extracted locally")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--di-latency", type=float, default=0.0, help="Document Intelligence latency per file (s)")
+    parser.add_argument("--di-page-latency", type=float, default=0.0, help="Document Intelligence latency per page (s)")
+    parser.add_argument("--embedding-latency", type=float, default=0.0, help="Embedding latency per request (s)")
+    parser.add_argument("--graph-latency", type=float, default=0.0, help="Graph transformer latency per chunk (s)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    # Run every size in a fresh process so peak RSS is measured per library size
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for size in args.sizes:
+        with ctx.Pool(1) as pool:
+            results.append(pool.apply(run_size, (size, args)))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    stages = ["list", "extract", "vector_store", "graph_store"]
+    header = f"{'docs':>6} {'chunks':>7} {'docs/s':>8} {'chunks/s':>9} {'rss MB':>8} " + " ".join(f"{s + ' s':>14}" for s in stages)
+    print(header)
+    for r in results:
+        print(
+            f"{r['documents']:>6} {r['chunks']:>7} {r['documents_per_sec']:>8.2f} {r['chunks_per_sec']:>9.1f} {r['peak_rss_mb']:>8.1f} "
+            + " ".join(f"{r['stage_seconds'].get(s, 0.0):>14.3f}" for s in stages)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+import pytest
+
+from src.services import registry
+from src.services.metrics import MetricsService
+
+
+@pytest.fixture(autouse=True)
+def metrics():
+    """Disabled metrics, so get_metrics() does not load the configuration from the environment"""
+    registry.override("metrics", MetricsService({"enabled": False}))
+    yield
+    registry.reset("metrics")
@@ -0,0 +1,30 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+pytest.importorskip("langgraph_sdk")
+
+from fastapi.testclient import TestClient
+
+from src.app import app
+from src.services import registry
+
+
+@pytest.fixture
+def client():
+    registry.override("config", {"ingest": {"trigger_client_state": "secret"}})
+    yield TestClient(app)
+    registry.reset("config")
+
+
+@pytest.mark.parametrize("body", [b"{not json", b"[]", b'{"value": "x"}', b'{"value": [1]}'])
+def test_trigger_rejects_malformed_body(client, body) -> None:
+    response = client.post("/ingest/trigger", content=body, headers={"Content-Type": "application/json"})
+
+    assert response.status_code == 400
+
+
+def test_trigger_rejects_wrong_client_state(client) -> None:
+    response = client.post("/ingest/trigger", json={"value": [{"clientState": "wrong"}]})
+
+    assert response.status_code == 403
@@ -0,0 +1,43 @@
+import pytest
+
+from src.services.context_packer import ContextPacker
+
+
+def make_packer(**overrides) -> ContextPacker:
+    config = {"token_budget": 1000, "chunk_overlap": 50, "min_overlap": 10}
+    config.update(overrides)
+    packer = ContextPacker(config)
+    packer.encoding = None  # Keep token counts deterministic
+    return packer
+
+
+def test_merges_overlapping_adjacent_chunks() -> None:
+    text = " ".join(f"word{i}" for i in range(60))
+    first, second = text[:200], text[160:]
+    packed = make_packer().pack([second, first])
+    assert packed == [text]
+
+
+def test_drops_near_duplicate_chunks() -> None:
+    original = "The quarterly report shows revenue grew by ten percent across all regions this year"
+    copy = original + " overall"
+    other = "Employees must submit expense claims within thirty days of purchase"
+    packed = make_packer().pack([original, copy, other])
+    assert packed == [original, other]
+
+
+def test_fits_token_budget() -> None:
+    docs = ["a" * 40, "b" * 40, "c" * 40]
+    packed = make_packer(token_budget=25).pack(docs)
+    assert packed == ["a" * 40, "b" * 40, "c" * 20]
+
+
+def test_counts_special_token_text_as_content() -> None:
+    pytest.importorskip("tiktoken")
+    packer = ContextPacker({"token_budget": 5})
+    if packer.encoding is None:
+        pytest.skip("cl100k_base encoding is not available")
+
+    doc = "Export ended with <|endoftext|> marker and then continued with more text"
+    assert packer.count_tokens("<|endoftext|>") > 1
+    assert packer.pack([doc]) == [packer._truncate(doc, 5)]
@@ -0,0 +1,53 @@
+import io
+import zipfile
+
+from src.services.extractors import get_extractor
+
+DOCUMENT_XML = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+  <w:body>
+    <w:p><w:r><w:t>Leave</w:t></w:r><w:r><w:t xml:space="preserve"> policy</w:t></w:r></w:p>
+    <w:tbl><w:tr><w:tc><w:p><w:r><w:t>Days</w:t><w:tab/><w:t>25</w:t></w:r></w:p></w:tc></w:tr></w:tbl>
+  </w:body>
+</w:document>"""
+
+
+TEXT_BOX_XML = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+            xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006">
+  <w:body>
+    <w:p><w:r><w:t>Outer</w:t></w:r><w:r><mc:AlternateContent>
+      <mc:Choice><w:txbxContent><w:p><w:r><w:t>Boxed</w:t></w:r></w:p></w:txbxContent></mc:Choice>
+      <mc:Fallback><w:txbxContent><w:p><w:r><w:t>Boxed</w:t></w:r></w:p></w:txbxContent></mc:Fallback>
+    </mc:AlternateContent></w:r></w:p>
+  </w:body>
+</w:document>"""
+
+
+def make_docx(document_xml: str) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", document_xml)
+    buffer.seek(0)
+    return buffer
+
+
+def test_extracts_docx_paragraphs_and_tables() -> None:
+    assert get_extractor(".DOCX")(make_docx(DOCUMENT_XML)) == "Leave policy\nDays\t25"
+
+
+def test_extracts_text_box_paragraphs_once() -> None:
+    assert get_extractor(".docx")(make_docx(TEXT_BOX_XML)) == "Outer\nBoxed"
+
+
+def test_decodes_text_files() -> None:
+    extract = get_extractor(".txt")
+
+    assert extract(io.BytesIO("﻿café".encode("utf-8"))) == "café"
+    assert extract(io.BytesIO("café".encode("cp1252"))) == "café"
+    assert extract(io.BytesIO("café".encode("utf-16"))) == "café"
+
+
+def test_formats_needing_layout_analysis_have_no_local_extractor() -> None:
+    assert get_extractor(".pdf") is None
+    assert get_extractor(".doc") is None
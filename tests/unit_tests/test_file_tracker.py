@@ -0,0 +1,74 @@
+import json
+import os
+import time
+
+from src.services.file_tracker import FileTracker
+
+
+def test_lease_is_exclusive_until_released(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    tracker = FileTracker()
+
+    assert tracker.acquire_lease("file-1", "worker-a", ttl=60)
+    assert not tracker.acquire_lease("file-1", "worker-b", ttl=60)
+    tracker.release_lease("file-1", "worker-a")
+    assert tracker.acquire_lease("file-1", "worker-b", ttl=60)
+
+
+def test_release_keeps_lease_taken_over_by_another_worker(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    tracker = FileTracker()
+
+    assert tracker.acquire_lease("file-1", "slow-worker", ttl=-1)
+    assert tracker.acquire_lease("file-1", "worker-b", ttl=60)
+    tracker.release_lease("file-1", "slow-worker")
+    assert not tracker.acquire_lease("file-1", "worker-c", ttl=60)
+    assert os.listdir(tracker.lease_dir) == ["file-1.lease"]
+
+
+def test_live_lease_is_not_broken(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    tracker = FileTracker()
+    path = os.path.join(tracker.lease_dir, "file-1.lease")
+
+    assert tracker.acquire_lease("file-1", "crashed-worker", ttl=-1)
+    with open(path) as f:
+        stale = json.load(f)
+    # Another worker broke the stale lease and took a fresh one after we read it
+    os.remove(path)
+    assert tracker.acquire_lease("file-1", "worker-b", ttl=60)
+    tracker._remove_if(path, lambda current: current == stale)
+
+    with open(path) as f:
+        assert json.load(f)["owner"] == "worker-b"
+
+
+def test_hold_lease_renews_expiry(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    tracker = FileTracker()
+
+    assert tracker.acquire_lease("file-1", "worker-a", ttl=0.3)
+    with tracker.hold_lease("file-1", "worker-a", ttl=0.3):
+        time.sleep(0.5)
+        assert not tracker.acquire_lease("file-1", "worker-b", ttl=60)
+    assert not tracker.renew_lease("file-1", "worker-b", ttl=60)
+
+
+def test_expired_lease_can_be_taken_over(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    tracker = FileTracker()
+
+    assert tracker.acquire_lease("file-1", "crashed-worker", ttl=-1)
+    assert tracker.acquire_lease("file-1", "worker-b", ttl=60)
+    with open(os.path.join(tracker.lease_dir, "file-1.lease")) as f:
+        assert json.load(f)["owner"] == "worker-b"
+
+
+def test_mark_files_processed_merges_with_existing(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    tracker = FileTracker()
+
+    tracker.mark_files_processed({"a"})
+    tracker.mark_files_processed({"b"})
+    assert tracker.load_processed_files() == {"a", "b"}
+    assert not os.path.exists(tracker.lock_file)
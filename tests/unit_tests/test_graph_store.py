@@ -0,0 +1,85 @@
+import pytest
+
+pytest.importorskip("langchain_neo4j")
+pytest.importorskip("langchain_experimental")
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from src.services import registry
+from src.services.graph_store import GraphStoreService
+
+
+class RecordingGraph:
+    def __init__(self):
+        self.queries = []
+
+    def query(self, query, params=None):
+        self.queries.append((query, params or {}))
+        return []
+
+
+class FakeVectorStore:
+    def __init__(self, matches):
+        self.matches = matches
+
+    def retrieve_with_scores(self, query, top_k=3):
+        return self.matches[:top_k]
+
+
+@pytest.fixture(autouse=True)
+def vector_store():
+    yield
+    registry.reset("vector_store")
+
+
+def make_store(storage="float64", dimension=4, quantization=False) -> GraphStoreService:
+    # Skip __init__, which connects to Neo4j and Azure OpenAI
+    store = GraphStoreService.__new__(GraphStoreService)
+    store.neo4j_graph = RecordingGraph()
+    store.text_splitter = RecursiveCharacterTextSplitter(chunk_size=30, chunk_overlap=0)
+    store.embedding_storage = storage
+    store.embedding_dimension = dimension
+    store.index_quantization = quantization
+    return store
+
+
+def test_compact_embedding_truncates_to_stored_dimension() -> None:
+    assert make_store(dimension=2)._compact_embedding([0.1, 0.2, 0.3]) == [0.1, 0.2]
+    assert make_store(dimension=None)._compact_embedding([0.1, 0.2, 0.3]) == [0.1, 0.2, 0.3]
+
+
+@pytest.mark.parametrize("quantization", [False, True])
+def test_create_indices_sizes_index_to_stored_dimension(quantization) -> None:
+    store = make_store(dimension=256, quantization=quantization)
+
+    store.create_indices()
+
+    [(query, params)] = store.neo4j_graph.queries
+    assert params == {"dimension": 256}
+    assert ("`vector.quantization.enabled`: true" in query) == quantization
+
+
+def test_create_indices_skipped_without_stored_embeddings() -> None:
+    store = make_store(storage="none")
+
+    store.create_indices()
+
+    assert store.neo4j_graph.queries == []
+
+
+def test_query_without_stored_embeddings_resolves_pinecone_matches() -> None:
+    store = make_store(storage="none")
+    docs = store._create_document_chunks(
+        "Employees get 25 days of leave. Leave requests go to the team manager. Unused days expire in March."
+    )
+    # Pinecone holds the same chunk texts as the Document nodes. Its raw cosine of 0.6 is
+    # 0.8 on Neo4j's scale and passes the threshold, 0.4 is 0.7 and does not
+    registry.override("vector_store", FakeVectorStore([
+        (docs[1].page_content, 0.9), (docs[0].page_content, 0.6), (docs[2].page_content, 0.4),
+    ]))
+
+    store.query_semantically("How do I request leave?", top_k=3, score_threshold=0.75)
+
+    chunk_ids = [params["chunk_id"] for _, params in store.neo4j_graph.queries]
+    assert chunk_ids == [docs[1].metadata["id"], docs[0].metadata["id"]]
+    assert not any("queryNodes" in query for query, _ in store.neo4j_graph.queries)
@@ -0,0 +1,18 @@
+from src.services.ingest_trigger import AdaptivePollInterval, IngestTrigger
+
+
+def test_poll_interval_backs_off_when_idle_and_resets_on_change() -> None:
+    poll = AdaptivePollInterval({"poll_min_seconds": 30, "poll_max_seconds": 100, "poll_backoff_factor": 2})
+
+    assert [poll.record(changed=False) for _ in range(3)] == [60, 100, 100]
+    assert poll.record(changed=True) == 30
+
+
+def test_trigger_wakes_waiter(tmp_path) -> None:
+    trigger_file = str(tmp_path / "ingest.trigger")
+    waiter = IngestTrigger(trigger_file, check_interval=0.01)
+
+    assert not waiter.wait(0.02)
+    IngestTrigger(trigger_file).fire()
+    assert waiter.wait(5)
+    assert not waiter.wait(0.02)
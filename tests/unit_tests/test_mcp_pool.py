@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("langchain_mcp_adapters")
+
+from src.services import mcp_pool
+
+
+class FakeTool:
+    description = "Fake tool"
+    args_schema = {"type": "object", "properties": {}}
+
+    def __init__(self, name, broken):
+        self.name = name
+        self.broken = broken
+
+    async def ainvoke(self, arguments):
+        await asyncio.sleep(0.01)
+        if self.broken:
+            raise ConnectionError("Session closed")
+        return "ok"
+
+
+class FakeClient:
+    """Stand-in for MultiServerMCPClient whose first session breaks when broken_sessions is set"""
+    sessions = 0
+    broken_sessions = 0
+
+    def __init__(self, servers):
+        pass
+
+    async def __aenter__(self):
+        FakeClient.sessions += 1
+        await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    def get_tools(self):
+        return [FakeTool("search", broken=FakeClient.sessions <= FakeClient.broken_sessions)]
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    FakeClient.sessions = 0
+    FakeClient.broken_sessions = 0
+    monkeypatch.setattr(mcp_pool, "MultiServerMCPClient", FakeClient)
+    return mcp_pool.MCPSessionPool({"servers": {}})
+
+
+def test_concurrent_calls_share_one_session(pool) -> None:
+    async def run():
+        results = await asyncio.gather(*(pool.call_tool("search", {}) for _ in range(10)))
+        await pool.close()
+        return results
+
+    assert asyncio.run(run()) == ["ok"] * 10
+    assert FakeClient.sessions == 1
+
+
+def test_broken_session_is_replaced_once(pool) -> None:
+    FakeClient.broken_sessions = 1
+
+    async def run():
+        results = await asyncio.gather(*(pool.call_tool("search", {}) for _ in range(10)))
+        await pool.close()
+        return results
+
+    assert asyncio.run(run()) == ["ok"] * 10
+    assert FakeClient.sessions == 2
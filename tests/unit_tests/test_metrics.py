@@ -0,0 +1,28 @@
+import pytest
+
+from src.services.metrics import MetricsService
+
+
+def test_disabled_metrics_record_nothing() -> None:
+    metrics = MetricsService({"enabled": False})
+
+    metrics.inc("ingest_documents_total", result="processed")
+    with metrics.time_dependency("pinecone", "query"):
+        pass
+    assert metrics.render() == "\n"
+
+
+def test_renders_prometheus_histograms_and_counters() -> None:
+    metrics = MetricsService({"enabled": True, "buckets": (0.1, 1.0)})
+
+    metrics.observe("dependency_duration_seconds", 0.5, service="neo4j", operation="query")
+    metrics.inc("cache_requests_total", cache="mcp_tools", result="hit")
+    with pytest.raises(RuntimeError):
+        with metrics.time_dependency("neo4j", "query"):
+            raise RuntimeError("boom")
+
+    output = metrics.render()
+    assert 'cache_requests_total{cache="mcp_tools",result="hit"} 1' in output
+    assert 'dependency_errors_total{operation="query",service="neo4j"} 1' in output
+    assert 'dependency_duration_seconds_bucket{operation="query",service="neo4j",le="1.0"} 2' in output
+    assert 'dependency_duration_seconds_count{operation="query",service="neo4j"} 2' in output
@@ -0,0 +1,81 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.agents.RAG_chatbot import nodes
+from src.services import registry
+from src.services.context_packer import ContextPacker
+from tests.benchmarks.fakes import FakeChatModel, FakeServiceError
+
+
+class ChatStartRecorder(BaseCallbackHandler):
+    def __init__(self):
+        self.starts = []
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self.starts.append(kwargs.get("tags") or [])
+
+
+class FailingGraderChatModel(FakeChatModel):
+    """Streams answers normally, but every non-streamed call, i.e. each grader call, fails"""
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise FakeServiceError("Simulated rate limit")
+
+
+@pytest.fixture
+def services():
+    executor = ThreadPoolExecutor(max_workers=1)
+    registry.override("config", {"rag": {"early_grading": True, "early_grading_interval": 50}})
+    registry.override("context_packer", ContextPacker({"token_budget": 1000}))
+    registry.override("grading_executor", executor)
+    yield
+    executor.shutdown()
+    for name in ("config", "context_packer", "grading_executor", "llm"):
+        registry.reset(name)
+
+
+def test_generate_aborts_off_track_answer(services) -> None:
+    registry.override("llm", FakeChatModel(answer_tokens=500, token_latency=0.002, grounded_rate=0.0))
+    recorder = ChatStartRecorder()
+    state = {"input": "What is the leave policy?", "documents": ["Leave is 25 days."], "loop_step": 0}
+
+    result = nodes.generate(state, {"callbacks": [recorder]})
+
+    assert result["generation_aborted"]
+    assert result["loop_step"] == 1
+    assert len(result["generation"].content.split()) < 500
+    # The partial grader ran on a pool thread but still reported to the run's callbacks
+    assert ["rag_answer"] in recorder.starts
+    assert any("rag_answer" not in tags for tags in recorder.starts)
+
+
+def test_generate_keeps_grounded_answer(services) -> None:
+    registry.override("llm", FakeChatModel(answer_tokens=100, grounded_rate=1.0))
+    state = {"input": "What is the leave policy?", "documents": ["Leave is 25 days."], "loop_step": 0}
+
+    result = nodes.generate(state, {})
+
+    assert not result["generation_aborted"]
+    assert len(result["generation"].content.split()) == 100
+
+
+def test_generate_survives_failing_partial_grader(services) -> None:
+    registry.override("llm", FailingGraderChatModel(answer_tokens=200, token_latency=0.002))
+    state = {"input": "What is the leave policy?", "documents": ["Leave is 25 days."], "loop_step": 0}
+
+    result = nodes.generate(state, {})
+
+    assert not result["generation_aborted"]
+    assert len(result["generation"].content.split()) == 200
+
+
+def test_aborted_generation_is_retried(services) -> None:
+    state = {"input": "q", "documents": [], "generation": None, "generation_aborted": True, "loop_step": 1}
+
+    assert nodes.grade_generation_v_documents_and_question(state) == "not supported"
+    assert nodes.grade_generation_v_documents_and_question({**state, "loop_step": 4}) == "max retries"
@@ -0,0 +1,28 @@
+import threading
+
+from src.services import registry
+
+
+def test_builds_service_once_on_first_use() -> None:
+    calls = []
+    registry.register("test_service", lambda: calls.append(1) or object())
+
+    assert not calls
+    threads = [threading.Thread(target=registry.get, args=("test_service",)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert registry.get("test_service") is registry.get("test_service")
+
+
+def test_override_replaces_instance() -> None:
+    fake = object()
+    registry.register("test_service", object)
+    registry.override("test_service", fake)
+
+    assert registry.get("test_service") is fake
+    registry.reset("test_service")
+    assert registry.get("test_service") is not fake
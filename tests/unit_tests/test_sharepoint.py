@@ -0,0 +1,66 @@
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("office365")
+pytest.importorskip("azure.ai.formrecognizer")
+pytest.importorskip("langchain_community")
+
+from src.services.sharepoint import SharePointService
+from tests.benchmarks.fakes import FakeClientContext, SyntheticLibrary
+
+
+@pytest.fixture
+def library():
+    return SyntheticLibrary(2, words_per_doc=50)
+
+
+def make_service(library, **overrides) -> SharePointService:
+    config = {
+        "url": "https://test.sharepoint.local/sites/test",
+        "library_name": "Documents",
+        "username": "user",
+        "password": "password",
+        "endpoint": "https://test.cognitiveservices.local",
+        "key": "key",
+        "download_chunk_bytes": 16,
+    }
+    config.update(overrides)
+    with patch("src.services.sharepoint.DocumentAnalysisClient"):
+        service = SharePointService(config)
+    service.connect = lambda: FakeClientContext(library)
+    return service
+
+
+def test_skip_reason_checks_patterns_then_size(library) -> None:
+    service = make_service(library, skip_patterns=["~$*", "*.tmp.docx"], max_file_bytes=100)
+
+    assert service.skip_reason("~$Draft.docx", 10) == "matches skip pattern '~$*'"
+    assert service.skip_reason("Notes.TMP.docx", 10) == "matches skip pattern '*.tmp.docx'"
+    assert "exceeds limit" in service.skip_reason("Report.docx", 101)
+    assert service.skip_reason("Report.docx", 100) is None
+
+
+def test_skips_files_matching_pattern_or_reported_over_cap(library) -> None:
+    files = make_service(library).get_all_files()
+    first, second = files
+    files[first]["name"] = "~$lock.txt"
+
+    docs = make_service(library, skip_patterns=["~$*"]).download_and_extract_text(files)
+    assert list(docs) == [second]
+
+    docs = make_service(library, max_file_bytes=10).download_and_extract_text(files)
+    assert docs == {}
+
+
+def test_skips_file_that_grows_past_cap_while_downloading(library) -> None:
+    files = make_service(library).get_all_files()
+    grown, unchanged = files
+    max_bytes = max(len(source.content) for source in library.files.values())
+    # Reported size stays within the cap, but twice as much content is streamed
+    source = next(iter(library.files.values()))
+    source.content = source.content * 2
+
+    docs = make_service(library, max_file_bytes=max_bytes).download_and_extract_text(files)
+
+    assert list(docs) == [unchanged]
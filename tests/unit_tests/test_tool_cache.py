@@ -0,0 +1,43 @@
+from src.services.tool_cache import ToolResultCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_cache(clock, **overrides) -> ToolResultCache:
+    config = {"ttls": {"list_files": 60}, "max_entries": 2}
+    config.update(overrides)
+    return ToolResultCache(config, clock=clock)
+
+
+def test_hits_with_reordered_arguments_until_ttl_expires() -> None:
+    clock = FakeClock()
+    cache = make_cache(clock)
+
+    cache.set("list_files", {"folder": "HR", "recursive": True}, "result")
+    assert cache.get("list_files", {"recursive": True, "folder": "HR"}) == (True, "result")
+    clock.now = 61
+    assert cache.get("list_files", {"folder": "HR", "recursive": True}) == (False, None)
+
+
+def test_only_allowlisted_tools_are_cached() -> None:
+    cache = make_cache(FakeClock())
+
+    cache.set("delete_file", {"path": "a.txt"}, "deleted")
+    assert cache.get("delete_file", {"path": "a.txt"}) == (False, None)
+
+
+def test_evicts_least_recently_used_entry() -> None:
+    cache = make_cache(FakeClock())
+
+    cache.set("list_files", {"folder": "a"}, 1)
+    cache.set("list_files", {"folder": "b"}, 2)
+    cache.get("list_files", {"folder": "a"})
+    cache.set("list_files", {"folder": "c"}, 3)
+    assert cache.get("list_files", {"folder": "b"}) == (False, None)
+    assert cache.get("list_files", {"folder": "a"}) == (True, 1)
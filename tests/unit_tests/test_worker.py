@@ -0,0 +1,31 @@
+from src.services import registry
+from src.services.file_tracker import FileTracker
+from src.services.metrics import MetricsService
+from src.worker import process_new_files
+
+
+class SkippingSharePoint:
+    def __init__(self):
+        self.connections = 0
+
+    def connect(self):
+        self.connections += 1
+        return object()
+
+    def download_and_extract_text(self, file_details, ctx=None):
+        assert ctx is not None
+        return {}
+
+
+def test_skipped_files_are_marked_processed_and_counted(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    metrics = MetricsService({"enabled": True})
+    registry.override("metrics", metrics)
+    tracker = FileTracker()
+    sharepoint = SkippingSharePoint()
+    process_new_files({"file-1": {"name": "huge.pdf"}, "file-2": {"name": "~$lock.docx"}}, "worker-a",
+                      tracker, sharepoint, None, None, lease_seconds=60)
+
+    assert tracker.load_processed_files() == {"file-1", "file-2"}
+    assert 'ingest_documents_total{result="skipped"} 2' in metrics.render()
+    assert sharepoint.connections == 1